@@ -6,6 +6,7 @@ Upload images to Filecoin and generate OpenSea-compatible metadata
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
 from typing import Any, Dict, Optional
@@ -74,6 +75,14 @@ def load_filecoin_client() -> Optional[FilecoinCloudClient]:
         return None
 
 
+def fetch_account_info(client):
+    """Fetch balance and storage info concurrently, returning completed futures"""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        balance_future = executor.submit(client.get_balance)
+        storage_future = executor.submit(client.get_storage_info)
+    return balance_future, storage_future
+
+
 def load_filecoin_direct_client() -> Optional[FilecoinDirectClient]:
     """Load and test Filecoin Direct client with improved error handling"""
     try:
@@ -420,32 +429,31 @@ def main():
                 # Account info
                 with st.expander("📊 Información de Cuenta"):
                     try:
+                        with st.spinner("Obteniendo balance e info de red..."):
+                            balance_future, storage_future = fetch_account_info(client)
+
                         col1, col2 = st.columns(2)
 
                         with col1:
-                            with st.spinner("Obteniendo balance..."):
-                                balance_info = client.get_balance()
-                                if balance_info.get("success"):
-                                    balances = balance_info.get("balances", {})
-                                    st.metric(
-                                        "Balance FIL", f"{balances.get('FIL', '0')} FIL"
-                                    )
-                                else:
-                                    st.warning("No se pudo obtener el balance")
+                            balance_info = balance_future.result()
+                            if balance_info.get("success"):
+                                balances = balance_info.get("balances", {})
+                                st.metric(
+                                    "Balance FIL", f"{balances.get('FIL', '0')} FIL"
+                                )
+                            else:
+                                st.warning("No se pudo obtener el balance")
 
                         with col2:
-                            with st.spinner("Obteniendo info de red..."):
-                                storage_info = client.get_storage_info()
-                                if storage_info.get("success"):
-                                    info = storage_info.get("info", {})
-                                    st.metric("Red", info.get("network", "Desconocida"))
-                                    st.metric(
-                                        "Proveedores", info.get("totalProviders", "0")
-                                    )
-                                else:
-                                    st.warning(
-                                        "No se pudo obtener info de almacenamiento"
-                                    )
+                            storage_info = storage_future.result()
+                            if storage_info.get("success"):
+                                info = storage_info.get("info", {})
+                                st.metric("Red", info.get("network", "Desconocida"))
+                                st.metric(
+                                    "Proveedores", info.get("totalProviders", "0")
+                                )
+                            else:
+                                st.warning("No se pudo obtener info de almacenamiento")
 
                     except Exception as e:
                         st.warning(f"⚠️ Error al cargar información: {str(e)}")
@@ -499,8 +507,12 @@ def main():
 
                 # Account info
                 with st.expander("📊 Account Info"):
+                    balance_future, storage_future = fetch_account_info(
+                        st.session_state.filecoin_client
+                    )
+
                     try:
-                        balance_info = st.session_state.filecoin_client.get_balance()
+                        balance_info = balance_future.result()
                         if "error" not in balance_info:
                             balances = balance_info.get("balances", {})
                             st.metric(
@@ -511,9 +523,7 @@ def main():
                         st.info("Could not load balance info")
 
                     try:
-                        storage_info = (
-                            st.session_state.filecoin_client.get_storage_info()
-                        )
+                        storage_info = storage_future.result()
                         if "error" not in storage_info:
                             info = storage_info.get("info", {})
                             st.metric(
@@ -5,22 +5,102 @@ Handles image and JSON uploads to Filecoin Cloud using Synapse SDK bridge
 
 import json
 import os
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
 import requests
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
 # Load environment variables
 load_dotenv()
 
 # Debug flag - set to False in production
 DEBUG = False
 
+# Location of the Node.js bridge service, resolved once at import
+BRIDGE_DIR = Path(__file__).resolve().parent.parent / "bridge"
+
+# Maximum time to wait for the bridge service to answer /health after spawning
+BRIDGE_STARTUP_TIMEOUT = 20
+
+# Packages imported by bridge/server.js that must be present in node_modules
+BRIDGE_KEY_DEPENDENCIES = (
+    "@filoz/synapse-sdk",
+    "cors",
+    "dotenv",
+    "ethers",
+    "express",
+    "multer",
+)
+
+
+class BridgeSettings(NamedTuple):
+    """Filecoin bridge configuration read from the environment"""
+
+    private_key: Optional[str]
+    rpc_url: str
+    bridge_url: str
+
+
+@lru_cache(maxsize=1)
+def _load_settings() -> BridgeSettings:
+    """Read the bridge settings from the environment once per process"""
+    env = os.environ
+    return BridgeSettings(
+        private_key=env.get("FILECOIN_PRIVATE_KEY"),
+        rpc_url=env.get(
+            "FILECOIN_RPC_URL", "https://filecoin-calibration.chainup.net/rpc/v1"
+        ),
+        bridge_url=env.get("FILECOIN_BRIDGE_URL", "http://localhost:3001"),
+    )
+
+
+@lru_cache(maxsize=1)
+def _node_executable() -> Optional[str]:
+    """Resolve the Node.js binary once per process"""
+    return shutil.which("node")
+
+
+def _scan_names(directory: Path) -> set:
+    """Return the entry names of a directory with a single scandir call"""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
+def _missing_bridge_dependencies(bridge_dir: Path) -> List[str]:
+    """List key bridge packages that are not installed in node_modules"""
+    node_modules = bridge_dir / "node_modules"
+    installed = {"": _scan_names(node_modules)}
+
+    missing = []
+    for dependency in BRIDGE_KEY_DEPENDENCIES:
+        scope, _, name = dependency.rpartition("/")
+        if scope not in installed:
+            installed[scope] = _scan_names(node_modules / scope)
+        if name not in installed[scope]:
+            missing.append(dependency)
+
+    return missing
+
 
 class FilecoinCloudClient:
     """Client for interacting with Filecoin Cloud via Node.js bridge service"""
@@ -33,16 +113,19 @@ class FilecoinCloudClient:
             private_key: Filecoin private key (if None, loads from env)
             rpc_url: Filecoin RPC URL (if None, loads from env)
         """
-        self.private_key = private_key or os.getenv("FILECOIN_PRIVATE_KEY")
-        self.rpc_url = rpc_url or os.getenv(
-            "FILECOIN_RPC_URL", "https://filecoin-calibration.chainup.net/rpc/v1"
-        )
+        settings = _load_settings()
+        self.private_key = private_key or settings.private_key
+        self.rpc_url = rpc_url or settings.rpc_url
 
         if not self.private_key:
             raise ValueError("Filecoin private key not found. Check .env file.")
 
-        self.bridge_url = os.getenv("FILECOIN_BRIDGE_URL", "http://localhost:3001")
+        self.bridge_url = settings.bridge_url
         self.bridge_process = None
+        self.bridge_stderr = deque(maxlen=200)
+
+        # Reuse one HTTP session so every bridge call shares pooled connections
+        self.session = requests.Session()
 
         # Ensure bridge service is running
         self._ensure_bridge_service()
@@ -51,7 +134,7 @@ class FilecoinCloudClient:
         """Ensure Node.js bridge service is running"""
         try:
             # Check if bridge is already running
-            response = requests.get(f"{self.bridge_url}/health", timeout=2)
+            response = self.session.get(f"{self.bridge_url}/health", timeout=2)
             if response.status_code == 200:
                 if DEBUG:
                     print("DEBUG: Bridge service already running")
@@ -70,36 +153,69 @@ class FilecoinCloudClient:
 
     def _start_bridge_service(self):
         """Start the Node.js bridge service"""
-        bridge_dir = Path(__file__).parent.parent / "bridge"
+        node_path = _node_executable()
+        if node_path is None:
+            raise Exception("Node.js not found in PATH - required for bridge service")
 
-        if not bridge_dir.exists():
+        if "server.js" not in _scan_names(BRIDGE_DIR):
             raise Exception("Bridge service directory not found")
 
+        missing_dependencies = _missing_bridge_dependencies(BRIDGE_DIR)
+        if missing_dependencies:
+            raise Exception(
+                "Bridge dependencies not installed: "
+                f"{', '.join(missing_dependencies)}. Run 'npm install' in bridge/"
+            )
+
         # Start the bridge service in background
         env = os.environ.copy()
         env["FILECOIN_PRIVATE_KEY"] = self.private_key
         env["FILECOIN_RPC_URL"] = self.rpc_url
 
         self.bridge_process = subprocess.Popen(
-            ["node", "server.js"],
-            cwd=bridge_dir,
+            [node_path, "server.js"],
+            cwd=BRIDGE_DIR,
             env=env,
-            stdout=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
         )
 
-        # Wait for service to start
-        import time
+        # Drain stderr in the background so a chatty bridge never fills the pipe
+        stderr_reader = threading.Thread(
+            target=self.bridge_stderr.extend,
+            args=(iter(self.bridge_process.stderr.readline, ""),),
+            daemon=True,
+        )
+        stderr_reader.start()
 
-        time.sleep(3)
+        # Poll /health with exponential backoff until the service is ready
+        delay = 0.05
+        deadline = time.monotonic() + BRIDGE_STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                response = self.session.get(
+                    f"{self.bridge_url}/health", timeout=(0.5, 0.5)
+                )
+                if response.status_code == 200:
+                    return
+            except requests.exceptions.RequestException:
+                pass
 
-        # Verify it's running
-        try:
-            response = requests.get(f"{self.bridge_url}/health", timeout=5)
-            if response.status_code != 200:
-                raise Exception("Bridge service failed to start properly")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Bridge service not responding: {e}")
+            if self.bridge_process.poll() is not None:
+                stderr_reader.join(timeout=1)
+                raise Exception(
+                    "Bridge service exited during startup: "
+                    f"{''.join(self.bridge_stderr).strip()}"
+                )
+
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.5)
+
+        raise Exception(
+            f"Bridge service not responding after {BRIDGE_STARTUP_TIMEOUT} seconds"
+        )
 
     def test_authentication(self) -> bool:
         """
@@ -109,13 +225,15 @@ class FilecoinCloudClient:
             bool: True if connection successful
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.bridge_url}/test",
                 json={"action": "test_auth"},
                 timeout=10,
             )
-            return response.status_code == 200 and response.json().get("success", False)
-        except requests.RequestException:
+            return response.status_code == 200 and _json_loads(response.content).get(
+                "success", False
+            )
+        except (requests.RequestException, ValueError):
             return False
 
     @retry(
@@ -165,7 +283,7 @@ class FilecoinCloudClient:
                 files = {"file": (filename, f, "application/octet-stream")}
                 data = {"filename": filename, "metadata": json.dumps(metadata or {})}
 
-                response = requests.post(
+                response = self.session.post(
                     f"{self.bridge_url}/upload/file",
                     files=files,
                     data=data,
@@ -184,7 +302,7 @@ class FilecoinCloudClient:
                     f"Failed to upload file: {response.status_code} - {response.text}"
                 )
 
-            result = response.json()
+            result = _json_loads(response.content)
             if not result.get("success"):
                 raise Exception(
                     f"Upload failed: {result.get('error', 'Unknown error')}"
@@ -232,7 +350,7 @@ class FilecoinCloudClient:
 
             payload = {"data": json_data, "name": name}
 
-            response = requests.post(
+            response = self.session.post(
                 f"{self.bridge_url}/upload/json",
                 json=payload,
                 timeout=60,
@@ -247,7 +365,7 @@ class FilecoinCloudClient:
                     f"Failed to upload JSON: {response.status_code} - {response.text}"
                 )
 
-            result = response.json()
+            result = _json_loads(response.content)
             if not result.get("success"):
                 raise Exception(
                     f"JSON upload failed: {result.get('error', 'Unknown error')}"
@@ -301,7 +419,7 @@ class FilecoinCloudClient:
             bytes: Downloaded file content
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.bridge_url}/download", json={"pieceCid": piece_cid}, timeout=60
             )
 
@@ -310,7 +428,7 @@ class FilecoinCloudClient:
                     f"Download failed: {response.status_code} - {response.text}"
                 )
 
-            result = response.json()
+            result = _json_loads(response.content)
             if not result.get("success"):
                 raise Exception(
                     f"Download failed: {result.get('error', 'Unknown error')}"
@@ -349,14 +467,14 @@ class FilecoinCloudClient:
             dict: Storage information and statistics
         """
         try:
-            response = requests.get(f"{self.bridge_url}/info", timeout=10)
+            response = self.session.get(f"{self.bridge_url}/info", timeout=10)
 
             if response.status_code == 200:
-                return response.json()
+                return _json_loads(response.content)
             else:
                 return {"error": f"Failed to get storage info: {response.status_code}"}
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             return {"error": f"Request failed: {str(e)}"}
 
     def validate_file_size(self, file_size: int, max_size_mb: int = 1000) -> bool:
@@ -381,10 +499,10 @@ class FilecoinCloudClient:
             dict: Balance information with USDFC and FIL balances
         """
         try:
-            response = requests.get(f"{self.bridge_url}/balance", timeout=10)
+            response = self.session.get(f"{self.bridge_url}/balance", timeout=10)
 
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 if result.get("success"):
                     return result.get("balances", {})
                 else:
@@ -392,7 +510,7 @@ class FilecoinCloudClient:
             else:
                 return {"error": f"Failed to get balance: {response.status_code}"}
 
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             return {"error": f"Request failed: {str(e)}"}
 
     def estimate_cost(self, file_size_bytes: int, duration_days: int = 30) -> float:
@@ -407,14 +525,14 @@ class FilecoinCloudClient:
             float: Estimated cost in USDFC
         """
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.bridge_url}/estimate",
                 json={"fileSizeBytes": file_size_bytes, "durationDays": duration_days},
                 timeout=10,
             )
 
             if response.status_code == 200:
-                result = response.json()
+                result = _json_loads(response.content)
                 if result.get("success"):
                     estimation = result.get("estimation", {})
                     return float(estimation.get("estimatedCostUSDFC", 0))
@@ -427,7 +545,10 @@ class FilecoinCloudClient:
             return 0.0
 
     def __del__(self):
-        """Cleanup bridge process on deletion"""
+        """Cleanup bridge process and HTTP session on deletion"""
+        if hasattr(self, "session"):
+            self.session.close()
+
         if hasattr(self, "bridge_process") and self.bridge_process:
             try:
                 self.bridge_process.terminate()
@@ -10,11 +10,22 @@ import os
 import tempfile
 import time
 from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
 
 # Load environment variables
 load_dotenv()
@@ -44,6 +55,23 @@ class FilecoinDirectClient:
         self.retry_delay = 2  # seconds
         self.timeout = 45  # increased timeout
 
+        # Reuse one HTTP session so RPC, IPFS and gateway calls share connections
+        self.session = requests.Session()
+
+        # Keep-alive pool for each RPC host. Only failed connections are retried
+        # here: the request never reached the node, so re-sending is safe even
+        # for MpoolPush. Timeouts and error statuses stay with _make_rpc_request
+        rpc_adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.3
+            ),
+        )
+        for url in self.rpc_urls:
+            parts = urlsplit(url)
+            self.session.mount(f"{parts.scheme}://{parts.netloc}/", rpc_adapter)
+
         if not self.private_key:
             raise ValueError("FILECOIN_PRIVATE_KEY not found in environment variables")
 
@@ -77,27 +105,24 @@ class FilecoinDirectClient:
             "https://dweb.link/ipfs/",
         ]
 
-    def _try_next_rpc_url(self):
-        """Switch to next available RPC URL"""
-        self.current_rpc_index = (self.current_rpc_index + 1) % len(self.rpc_urls)
-        self.rpc_url = self.rpc_urls[self.current_rpc_index]
-        print(f"Switching to RPC URL: {self.rpc_url}")
-
     def _make_rpc_request(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Make RPC request with retry logic and fallback URLs"""
-        original_rpc_index = self.current_rpc_index
+        # The failover order is local to each call, starting from the active URL:
+        # concurrent requests on this client must not move each other's endpoint
+        rpc_urls = [self.rpc_url]
+        rpc_urls += [url for url in self.rpc_urls if url != self.rpc_url]
 
         # Try all RPC URLs
-        for rpc_attempt in range(len(self.rpc_urls)):
+        for rpc_attempt, rpc_url in enumerate(rpc_urls):
             # For each URL, try multiple times
             for attempt in range(self.max_retries):
                 try:
-                    response = requests.post(
-                        self.rpc_url, json=payload, timeout=self.timeout
+                    response = self.session.post(
+                        rpc_url, json=payload, timeout=self.timeout
                     )
 
                     if response.status_code == 200:
-                        return response.json()
+                        return _json_loads(response.content)
                     elif response.status_code == 429:  # Rate limited
                         if attempt < self.max_retries - 1:
                             time.sleep(self.retry_delay * (attempt + 1))
@@ -134,14 +159,10 @@ class FilecoinDirectClient:
                         break
 
             # Move to next RPC URL if we haven't tried all of them
-            if rpc_attempt < len(self.rpc_urls) - 1:
-                self._try_next_rpc_url()
+            if rpc_attempt < len(rpc_urls) - 1:
+                print(f"Switching to RPC URL: {rpc_urls[rpc_attempt + 1]}")
                 time.sleep(1)  # Brief pause before trying next URL
 
-        # Reset to original RPC index
-        self.current_rpc_index = original_rpc_index
-        self.rpc_url = self.rpc_urls[self.current_rpc_index]
-
         # If we've tried all URLs and all retries, raise appropriate error
         raise ConnectionError(
             f"No se pudo conectar a ningún endpoint de Filecoin después de intentar {len(self.rpc_urls)} URLs con {self.max_retries} reintentos cada una"
@@ -204,7 +225,7 @@ class FilecoinDirectClient:
         headers = {"Authorization": f"Bearer {endpoint['token']}"}
         files = {"file": (filename, file_bytes)}
 
-        response = requests.post(
+        response = self.session.post(
             f"{endpoint['url']}/upload",
             headers=headers,
             files=files,
@@ -212,7 +233,7 @@ class FilecoinDirectClient:
         )
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             return result.get("cid")
         return None
 
@@ -223,7 +244,7 @@ class FilecoinDirectClient:
         headers = {"Authorization": f"Bearer {endpoint['token']}"}
         files = {"file": (filename, file_bytes)}
 
-        response = requests.post(
+        response = self.session.post(
             f"{endpoint['url']}/upload",
             headers=headers,
             files=files,
@@ -231,7 +252,7 @@ class FilecoinDirectClient:
         )
 
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             return result.get("value", {}).get("cid")
         return None
 
@@ -361,7 +382,7 @@ class FilecoinDirectClient:
         for gateway in self.ipfs_gateways:
             try:
                 url = f"{gateway}{cid}"
-                response = requests.get(url, timeout=30)
+                response = self.session.get(url, timeout=30)
                 if response.status_code == 200:
                     return response.content
             except Exception as e:
@@ -389,7 +410,8 @@ class FilecoinDirectClient:
 
             if result and "result" in result:
                 balance_attoFIL = int(result["result"])
-                balance_FIL = balance_attoFIL / (10**18)  # Convert from attoFIL to FIL
+                # Exact attoFIL -> FIL conversion (float division loses precision)
+                balance_FIL = Decimal(balance_attoFIL).scaleb(-18)
 
                 return {
                     "success": True,
@@ -4,11 +4,28 @@ Comprehensive logging system for tracking all Pinata uploads in JSON format
 """
 
 import json
+import mmap
 import os
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+    _json_loads = json.loads
+
+# Write buffer for log exports, so large exports flush in few syscalls
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Logs above this size are parsed from a memory map instead of a bytes copy;
+# below it the mmap setup costs more than the copy it saves
+MMAP_LOAD_THRESHOLD = 4 << 20
+
 
 class UploadLogger:
     """Logger for tracking IPFS uploads with detailed metadata"""
@@ -43,8 +60,15 @@ class UploadLogger:
     def _load_log_data(self) -> Dict[str, Any]:
         """Load existing log data"""
         try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(self.log_file, "rb") as f:
+                if (
+                    orjson is not None
+                    and os.fstat(f.fileno()).st_size > MMAP_LOAD_THRESHOLD
+                ):
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            return orjson.loads(view)
+                return _json_loads(f.read())
         except (FileNotFoundError, json.JSONDecodeError):
             self._initialize_log_file()
             return self._load_log_data()
@@ -98,13 +122,13 @@ class UploadLogger:
         """
         data = self._load_log_data()
 
-        upload_id = (
-            f"upload_{len(data['uploads']) + 1}_{int(datetime.now().timestamp())}"
-        )
+        # Read the clock once so the ID and the timestamp always agree
+        now = datetime.now()
+        upload_id = f"upload_{len(data['uploads']) + 1}_{int(now.timestamp())}"
 
         upload_entry = {
             "upload_id": upload_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "upload_type": upload_type,
             "status": status,
             "file_info": {
@@ -156,13 +180,13 @@ class UploadLogger:
         """
         data = self._load_log_data()
 
-        upload_id = (
-            f"failed_{len(data['uploads']) + 1}_{int(datetime.now().timestamp())}"
-        )
+        # Read the clock once so the ID and the timestamp always agree
+        now = datetime.now()
+        upload_id = f"failed_{len(data['uploads']) + 1}_{int(now.timestamp())}"
 
         upload_entry = {
             "upload_id": upload_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "upload_type": upload_type,
             "status": "failed",
             "file_info": {
@@ -187,45 +211,38 @@ class UploadLogger:
             dict: Upload statistics
         """
         data = self._load_log_data()
+        uploads = data["uploads"]
 
-        successful_uploads = [u for u in data["uploads"] if u["status"] == "success"]
-        failed_uploads = [u for u in data["uploads"] if u["status"] == "failed"]
-
-        image_uploads = [u for u in successful_uploads if u["upload_type"] == "image"]
-        metadata_uploads = [
-            u for u in successful_uploads if u["upload_type"] == "metadata"
-        ]
+        # Aggregate everything in a single pass over the uploads
+        successful = failed = images = metadata = 0
+        total_size = 0
+        for upload in uploads:
+            status = upload["status"]
+            if status == "success":
+                successful += 1
+                total_size += upload["file_info"]["file_size_bytes"]
+                upload_type = upload["upload_type"]
+                if upload_type == "image":
+                    images += 1
+                elif upload_type == "metadata":
+                    metadata += 1
+            elif status == "failed":
+                failed += 1
 
         stats = {
-            "total_uploads": len(data["uploads"]),
-            "successful_uploads": len(successful_uploads),
-            "failed_uploads": len(failed_uploads),
-            "success_rate": len(successful_uploads) / len(data["uploads"])
-            if data["uploads"]
-            else 0,
+            "total_uploads": len(uploads),
+            "successful_uploads": successful,
+            "failed_uploads": failed,
+            "success_rate": successful / len(uploads) if uploads else 0,
             "uploads_by_type": {
-                "image": len(image_uploads),
-                "metadata": len(metadata_uploads),
+                "image": images,
+                "metadata": metadata,
             },
-            "total_size_bytes": sum(
-                u["file_info"]["file_size_bytes"] for u in successful_uploads
-            ),
-            "total_size_mb": sum(
-                u["file_info"]["file_size_bytes"] for u in successful_uploads
-            )
-            / (1024 * 1024),
-            "average_file_size_bytes": sum(
-                u["file_info"]["file_size_bytes"] for u in successful_uploads
-            )
-            / len(successful_uploads)
-            if successful_uploads
-            else 0,
-            "first_upload": data["uploads"][0]["timestamp"]
-            if data["uploads"]
-            else None,
-            "last_upload": data["uploads"][-1]["timestamp"]
-            if data["uploads"]
-            else None,
+            "total_size_bytes": total_size,
+            "total_size_mb": total_size / (1024 * 1024),
+            "average_file_size_bytes": total_size / successful if successful else 0,
+            "first_upload": uploads[0]["timestamp"] if uploads else None,
+            "last_upload": uploads[-1]["timestamp"] if uploads else None,
         }
 
         return stats
@@ -267,30 +284,32 @@ class UploadLogger:
             list: Matching uploads
         """
         data = self._load_log_data()
-        results = data["uploads"]
+
+        # Combine the active criteria so the uploads are filtered in one pass
+        checks = []
 
         if upload_type:
-            results = [u for u in results if u["upload_type"] == upload_type]
+            checks.append(lambda u: u["upload_type"] == upload_type)
 
         if status:
-            results = [u for u in results if u["status"] == status]
+            checks.append(lambda u: u["status"] == status)
 
         if filename_contains:
-            results = [
-                u
-                for u in results
-                if filename_contains.lower()
-                in u["file_info"]["original_filename"].lower()
-            ]
+            needle = filename_contains.lower()
+            checks.append(
+                lambda u: needle in u["file_info"]["original_filename"].lower()
+            )
 
         if cid:
-            results = [u for u in results if u.get("ipfs_info", {}).get("cid") == cid]
+            checks.append(lambda u: u.get("ipfs_info", {}).get("cid") == cid)
 
         if start_date:
-            results = [u for u in results if u["timestamp"] >= start_date]
+            checks.append(lambda u: u["timestamp"] >= start_date)
 
         if end_date:
-            results = [u for u in results if u["timestamp"] <= end_date]
+            checks.append(lambda u: u["timestamp"] <= end_date)
+
+        results = [u for u in data["uploads"] if all(check(u) for check in checks)]
 
         return results
 
@@ -303,40 +322,39 @@ class UploadLogger:
         """
         data = self._load_log_data()
 
+        # Index images by CID and collect metadata uploads in a single pass
+        image_uploads = {}
+        metadata_uploads = []
+        for upload in data["uploads"]:
+            if upload["status"] != "success":
+                continue
+            if upload["upload_type"] == "image":
+                image_uploads[upload["ipfs_info"]["cid"]] = upload
+            elif upload["upload_type"] == "metadata":
+                metadata_uploads.append(upload)
+
         # Group by related_cid to find pairs
         pairs = []
-        image_uploads = {
-            u["ipfs_info"]["cid"]: u
-            for u in data["uploads"]
-            if u["upload_type"] == "image" and u["status"] == "success"
-        }
-
-        metadata_uploads = [
-            u
-            for u in data["uploads"]
-            if u["upload_type"] == "metadata" and u["status"] == "success"
-        ]
-
         for metadata_upload in metadata_uploads:
             related_cid = metadata_upload["ipfs_info"].get("related_cid")
-            if related_cid and related_cid in image_uploads:
-                pairs.append(
-                    {
-                        "nft_name": metadata_upload.get("nft_metadata", {}).get(
-                            "name", "Unknown"
-                        ),
-                        "image_upload": image_uploads[related_cid],
-                        "metadata_upload": metadata_upload,
-                        "created_at": metadata_upload["timestamp"],
-                        "image_uri": image_uploads[related_cid]["ipfs_info"][
-                            "ipfs_uri"
-                        ],
-                        "metadata_uri": metadata_upload["ipfs_info"]["ipfs_uri"],
-                        "nft_token_uri": metadata_upload["ipfs_info"][
-                            "ipfs_uri"
-                        ],  # This is the main URI
-                    }
-                )
+            image_upload = image_uploads.get(related_cid) if related_cid else None
+            if image_upload is None:
+                continue
+
+            metadata_uri = metadata_upload["ipfs_info"]["ipfs_uri"]
+            pairs.append(
+                {
+                    "nft_name": metadata_upload.get("nft_metadata", {}).get(
+                        "name", "Unknown"
+                    ),
+                    "image_upload": image_upload,
+                    "metadata_upload": metadata_upload,
+                    "created_at": metadata_upload["timestamp"],
+                    "image_uri": image_upload["ipfs_info"]["ipfs_uri"],
+                    "metadata_uri": metadata_uri,
+                    "nft_token_uri": metadata_uri,  # This is the main URI
+                }
+            )
 
         return sorted(pairs, key=lambda x: x["created_at"], reverse=True)
 
@@ -363,13 +381,29 @@ class UploadLogger:
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         if format_type == "json":
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                with open(output_path, "wb", buffering=EXPORT_BUFFER_SIZE) as f:
+                    f.write(
+                        orjson.dumps(
+                            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                        )
+                    )
+            else:
+                with open(
+                    output_path, "w", encoding="utf-8", buffering=EXPORT_BUFFER_SIZE
+                ) as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
 
         elif format_type == "csv":
             import csv
 
-            with open(output_path, "w", newline="", encoding="utf-8") as f:
+            with open(
+                output_path,
+                "w",
+                newline="",
+                encoding="utf-8",
+                buffering=EXPORT_BUFFER_SIZE,
+            ) as f:
                 if data["uploads"]:
                     # Flatten the upload data for CSV
                     fieldnames = [
@@ -383,21 +417,23 @@ class UploadLogger:
                         "ipfs_uri",
                     ]
 
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-
-                    for upload in data["uploads"]:
-                        row = {
-                            "upload_id": upload["upload_id"],
-                            "timestamp": upload["timestamp"],
-                            "upload_type": upload["upload_type"],
-                            "status": upload["status"],
-                            "filename": upload["file_info"]["original_filename"],
-                            "file_size_bytes": upload["file_info"]["file_size_bytes"],
-                            "cid": upload.get("ipfs_info", {}).get("cid", ""),
-                            "ipfs_uri": upload.get("ipfs_info", {}).get("ipfs_uri", ""),
-                        }
-                        writer.writerow(row)
+                    writer = csv.writer(f)
+                    writer.writerow(fieldnames)
+
+                    # Write plain rows in fieldnames order; no per-row dict needed
+                    writer.writerows(
+                        (
+                            upload["upload_id"],
+                            upload["timestamp"],
+                            upload["upload_type"],
+                            upload["status"],
+                            upload["file_info"]["original_filename"],
+                            upload["file_info"]["file_size_bytes"],
+                            upload.get("ipfs_info", {}).get("cid", ""),
+                            upload.get("ipfs_info", {}).get("ipfs_uri", ""),
+                        )
+                        for upload in data["uploads"]
+                    )
 
         return str(output_path)
 
@@ -485,12 +521,20 @@ class UploadLogger:
 
         # Filter out ignored CIDs if provided
         if ignored_cids:
-            uploads = [
+            kept = (
                 upload
-                for upload in uploads
+                for upload in (reversed(uploads) if limit > 0 else uploads)
                 if upload.get("ipfs_info", {}).get("cid", "") not in ignored_cids
                 and upload.get("cid", "") not in ignored_cids
-            ]
+            )
+
+            if limit > 0:
+                # Walk back from the newest upload and stop once enough are kept
+                recent = list(islice(kept, limit))
+                recent.reverse()
+                return recent
+
+            uploads = list(kept)
 
         return uploads[-limit:]
 
@@ -4,24 +4,67 @@ Setup Script for NFT IPFS Uploader
 Automates the installation and configuration process
 """
 
+import hashlib
+import json
 import os
 import shutil
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+# Project directory; all setup paths are anchored here instead of the process cwd
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# Marker of the last fully successful setup, used to skip reinstalling packages
+SETUP_CACHE_FILE = Path.home() / ".cache" / "nft_ipfs_uploader_setup.json"
+
+# Separator lines used by the section headers
+_HEADER_RULE = "=" * 60
+_HEADER_OPEN = "\n" + _HEADER_RULE
+_STEP_RULE = "-" * 40
+
 
 def print_header(title):
     """Print a formatted header"""
-    print("\n" + "=" * 60)
+    print(_HEADER_OPEN)
     print(f"  {title}")
-    print("=" * 60)
+    print(_HEADER_RULE)
 
 
 def print_step(step_num, title):
     """Print a formatted step"""
     print(f"\n📋 Step {step_num}: {title}")
-    print("-" * 40)
+    print(_STEP_RULE)
+
+
+def dependencies_fingerprint():
+    """Hash the interpreter and requirements that the pip install depends on"""
+    requirements = PROJECT_DIR / "requirements.txt"
+    state = {
+        "python": sys.executable,
+        "requirements": requirements.read_text() if requirements.exists() else "",
+    }
+    return hashlib.blake2b(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+
+def load_last_green():
+    """Return the fingerprint stored by the last successful setup, if any"""
+    try:
+        return json.loads(SETUP_CACHE_FILE.read_text()).get("hash")
+    except (OSError, ValueError):
+        return None
+
+
+def save_last_green(fingerprint):
+    """Store the fingerprint of a successful setup"""
+    try:
+        SETUP_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SETUP_CACHE_FILE.write_text(
+            json.dumps({"hash": fingerprint, "timestamp": time.time()})
+        )
+    except OSError:
+        pass
 
 
 def check_python_version():
@@ -42,6 +85,10 @@ def install_dependencies():
     """Install required Python packages"""
     print_step(2, "Installing Dependencies")
 
+    if dependencies_fingerprint() == load_last_green():
+        print("✅ Dependencies unchanged since last successful setup - skipping")
+        return True
+
     try:
         # Check if pip is available
         subprocess.run(
@@ -53,6 +100,7 @@ def install_dependencies():
         print("📦 Installing packages from requirements.txt...")
         result = subprocess.run(
             [sys.executable, "-m", "pip", "install", "-r", "requirements.txt"],
+            cwd=PROJECT_DIR,
             capture_output=True,
             text=True,
         )
@@ -78,8 +126,8 @@ def setup_environment():
     """Setup environment variables"""
     print_step(3, "Setting up Environment")
 
-    env_file = Path(".env")
-    env_example = Path(".env.example")
+    env_file = PROJECT_DIR / ".env"
+    env_example = PROJECT_DIR / ".env.example"
 
     # Check if .env already exists
     if env_file.exists():
@@ -121,7 +169,7 @@ def create_directories():
 
     try:
         for directory in directories:
-            Path(directory).mkdir(parents=True, exist_ok=True)
+            (PROJECT_DIR / directory).mkdir(parents=True, exist_ok=True)
             print(f"✅ Created directory: {directory}")
 
         return True
@@ -160,7 +208,7 @@ def test_installation():
         print("✅ tenacity imported successfully")
 
         # Test local modules
-        sys.path.append("modules")
+        sys.path.append(str(PROJECT_DIR / "modules"))
         from pinata_client import PinataClient
 
         print("✅ PinataClient imported successfully")
@@ -184,29 +232,37 @@ def show_next_steps():
     """Show what to do next"""
     print_header("🚀 Setup Complete!")
 
-    print("Next steps:")
-    print("")
-    print("1. Configure your Pinata API credentials:")
-    print("   Edit the .env file with your API keys")
-    print("")
-    print("2. Test your connection:")
-    print("   python test_connection.py")
-    print("")
-    print("3. Run the application:")
-    print("   python run.py")
-    print("   or")
-    print("   streamlit run app.py")
-    print("")
-    print("4. For programmatic usage examples:")
-    print("   python example_usage.py")
-    print("")
-    print("📚 Documentation:")
-    print("   See README.md for detailed instructions")
-    print("")
-    print("🆘 Need help?")
-    print("   - Check the troubleshooting section in README.md")
-    print("   - Ensure your Pinata account has available quota")
-    print("   - Verify your internet connection")
+    # Emit the whole section with a single write instead of one print per line
+    sys.stdout.write(
+        "\n".join(
+            [
+                "Next steps:",
+                "",
+                "1. Configure your Pinata API credentials:",
+                "   Edit the .env file with your API keys",
+                "",
+                "2. Test your connection:",
+                "   python test_connection.py",
+                "",
+                "3. Run the application:",
+                "   python run.py",
+                "   or",
+                "   streamlit run app.py",
+                "",
+                "4. For programmatic usage examples:",
+                "   python example_usage.py",
+                "",
+                "📚 Documentation:",
+                "   See README.md for detailed instructions",
+                "",
+                "🆘 Need help?",
+                "   - Check the troubleshooting section in README.md",
+                "   - Ensure your Pinata account has available quota",
+                "   - Verify your internet connection",
+            ]
+        )
+        + "\n"
+    )
 
 
 def main():
@@ -231,8 +287,10 @@ def main():
     success &= test_installation()
 
     if success:
+        save_last_green(dependencies_fingerprint())
         show_next_steps()
     else:
+        SETUP_CACHE_FILE.unlink(missing_ok=True)
         print("\n❌ Setup failed!")
         print("Please check the errors above and try again")
         sys.exit(1)
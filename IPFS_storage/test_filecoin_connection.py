@@ -7,6 +7,7 @@ This script tests the connection to multiple Filecoin RPC endpoints
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add modules directory to path
@@ -15,6 +16,38 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "modules"))
 from filecoin_direct_client import FilecoinDirectClient
 
 
+def probe_endpoint(client, url):
+    """Probe a single RPC endpoint with one batched Version + ChainHead call"""
+    payload = [
+        {"jsonrpc": "2.0", "method": "Filecoin.Version", "params": [], "id": 1},
+        {"jsonrpc": "2.0", "method": "Filecoin.ChainHead", "params": [], "id": 2},
+    ]
+
+    try:
+        start_time = time.time()
+        response = client.session.post(url, json=payload, timeout=client.timeout)
+        response_time = (time.time() - start_time) * 1000  # Convert to ms
+
+        result = response.json() if response.status_code == 200 else None
+        responses = {}
+        if isinstance(result, list):
+            responses = {item.get("id"): item for item in result}
+
+        if "result" in responses.get(2, {}):
+            version = responses.get(1, {}).get("result") or {}
+            return {
+                "url": url,
+                "response_time": response_time,
+                "version": version.get("Version", "N/A"),
+                "status": "success",
+            }
+
+        return {"url": url, "error": "No valid response", "status": "failed"}
+
+    except Exception as e:
+        return {"url": url, "error": f"{type(e).__name__}: {e}", "status": "error"}
+
+
 def test_filecoin_connection():
     """Test Filecoin connection with detailed reporting"""
     print("=" * 60)
@@ -44,54 +77,25 @@ def test_filecoin_connection():
         working_endpoints = []
         failed_endpoints = []
 
-        for i, url in enumerate(client.rpc_urls):
-            print(f"\n   [{i + 1}/{len(client.rpc_urls)}] Probando: {url}")
-
-            # Temporarily set this as the active URL
-            original_url = client.rpc_url
-            client.rpc_url = url
-
-            try:
-                start_time = time.time()
-
-                # Test basic RPC call
-                payload = {
-                    "jsonrpc": "2.0",
-                    "method": "Filecoin.ChainHead",
-                    "params": [],
-                    "id": 1,
-                }
-
-                result = client._make_rpc_request(payload)
-                end_time = time.time()
-                response_time = (end_time - start_time) * 1000  # Convert to ms
-
-                if result and "result" in result:
-                    print(f"      ✅ Éxito - Tiempo: {response_time:.0f}ms")
-                    working_endpoints.append(
-                        {
-                            "url": url,
-                            "response_time": response_time,
-                            "status": "success",
-                        }
-                    )
-                else:
-                    print(f"      ❌ Sin respuesta válida")
-                    failed_endpoints.append(
-                        {"url": url, "error": "No valid response", "status": "failed"}
-                    )
-
-            except Exception as e:
-                print(f"      ❌ Error: {type(e).__name__}: {str(e)}")
-                failed_endpoints.append(
-                    {"url": url, "error": str(e), "status": "error"}
-                )
+        # Probe every endpoint concurrently; wall time is the slowest probe
+        with ThreadPoolExecutor(max_workers=len(client.rpc_urls)) as executor:
+            results = list(
+                executor.map(lambda url: probe_endpoint(client, url), client.rpc_urls)
+            )
 
-            # Restore original URL
-            client.rpc_url = original_url
+        for i, endpoint in enumerate(results):
+            print(f"\n   [{i + 1}/{len(client.rpc_urls)}] Probando: {endpoint['url']}")
 
-            # Small delay between tests
-            time.sleep(0.5)
+            if endpoint["status"] == "success":
+                print(f"      ✅ Éxito - Tiempo: {endpoint['response_time']:.0f}ms")
+                print(f"      • Versión del nodo: {endpoint['version']}")
+                working_endpoints.append(endpoint)
+            elif endpoint["status"] == "failed":
+                print(f"      ❌ Sin respuesta válida")
+                failed_endpoints.append(endpoint)
+            else:
+                print(f"      ❌ Error: {endpoint['error']}")
+                failed_endpoints.append(endpoint)
 
         # Summary
         print(f"\n📊 RESUMEN DE CONEXIONES:")
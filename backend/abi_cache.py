@@ -0,0 +1,41 @@
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, List
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson es opcional; se usa el parser estándar
+    _json_loads = json.loads
+
+
+def load_contract_abi(artifact_path: Path) -> List[Any]:
+    """Carga el ABI de un artefacto de Hardhat usando una caché pickle
+
+    El artefacto incluye el bytecode completo, pero solo se usa el campo
+    ``abi``. La caché se guarda junto al artefacto y se invalida cuando el
+    artefacto es más reciente.
+    """
+    artifact_path = Path(artifact_path)
+    cache_path = artifact_path.with_suffix(".abi.pkl")
+
+    try:
+        if cache_path.stat().st_mtime >= artifact_path.stat().st_mtime:
+            return pickle.loads(cache_path.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    abi = _json_loads(artifact_path.read_bytes())["abi"]
+
+    # Escritura atómica para que lecturas concurrentes nunca vean un archivo a medias
+    try:
+        tmp_path = cache_path.with_suffix(f".tmp{os.getpid()}")
+        tmp_path.write_bytes(pickle.dumps(abi, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return abi
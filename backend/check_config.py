@@ -11,11 +11,59 @@ Usage:
 
 import json
 import os
+import string
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
-from web3 import Web3
+from abi_cache import load_contract_abi
+from multicall import call_views
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+
+SEPARATOR = "=" * 50
+
+PLACEHOLDER_PRIVATE_KEY = "your_private_key_here_without_0x_prefix"
+
+# Validation rules for the required environment variables
+ENV_SCHEMA = {
+    "PRIVATE_KEY": {"placeholder": PLACEHOLDER_PRIVATE_KEY, "hex_length": 64},
+    "RPC_URL": {"prefixes": ("http://", "https://")},
+}
+
+
+def validate_environment():
+    """Validate environment variables against ENV_SCHEMA in a single pass"""
+    env = {var: os.getenv(var) for var in ENV_SCHEMA}
+    errors = []
+
+    for var, rules in ENV_SCHEMA.items():
+        value = env[var]
+        if not value:
+            errors.append(f"{var} is not set")
+            continue
+
+        if value == rules.get("placeholder"):
+            continue
+
+        prefixes = rules.get("prefixes")
+        if prefixes and not value.startswith(prefixes):
+            errors.append(f"{var} must start with {' or '.join(prefixes)}")
+
+        hex_length = rules.get("hex_length")
+        if hex_length:
+            digits = value[2:] if value.startswith("0x") else value
+            if len(digits) != hex_length or not all(
+                c in string.hexdigits for c in digits
+            ):
+                errors.append(f"{var} must be {hex_length} hexadecimal characters")
+
+    return env, errors
 
 
 def check_configuration():
@@ -23,31 +71,33 @@ def check_configuration():
     print("🔍 Checking backend configuration...")
 
     # Load environment variables
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     # Check required environment variables
-    required_vars = ["PRIVATE_KEY", "RPC_URL"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    env, errors = validate_environment()
 
-    if missing_vars:
-        print(f"❌ Missing environment variables: {', '.join(missing_vars)}")
+    if errors:
+        print("❌ Invalid environment variables:")
+        for error in errors:
+            print(f"   - {error}")
         print("   Please check your .env file")
         return False
 
     print("✅ All required environment variables are set")
 
-    # Check RPC connection
-    try:
-        web3 = Web3(Web3.HTTPProvider(os.getenv("RPC_URL")))
-        if not web3.is_connected():
-            print("❌ Cannot connect to RPC URL")
-            return False
+    # Deferred until the env check passes: importing web3 takes hundreds of ms
+    from web3 import Web3
 
+    # Check RPC connection; fetching the block number doubles as the probe
+    try:
+        web3 = Web3(Web3.HTTPProvider(env["RPC_URL"]))
         block_number = web3.eth.block_number
         print(f"✅ Connected to Arbitrum Sepolia - Block: {block_number}")
 
     except Exception as e:
-        print(f"❌ RPC connection error: {e}")
+        print(f"❌ Cannot connect to RPC URL: {e}")
         return False
 
     # Check contract ABI
@@ -66,9 +116,7 @@ def check_configuration():
             print("   Run 'npm run compile' in the project root")
             return False
 
-        with open(artifact_path, "r") as f:
-            artifact = json.load(f)
-            contract_abi = artifact["abi"]
+        contract_abi = load_contract_abi(artifact_path)
 
         print(f"✅ Contract ABI loaded ({len(contract_abi)} functions)")
 
@@ -85,18 +133,20 @@ def check_configuration():
             print("   Run 'npm run deploy' in the project root")
             return False
 
-        with open(deployment_file, "r") as f:
-            deployment_info = json.load(f)
+        with open(deployment_file, "rb") as f:
+            deployment_info = _json_loads(f.read())
 
         contract_address = deployment_info["contractAddress"]
         contract = web3.eth.contract(
             address=Web3.to_checksum_address(contract_address), abi=contract_abi
         )
 
-        # Test contract functions
-        contract_name = contract.functions.name().call()
-        contract_symbol = contract.functions.symbol().call()
-        next_token_id = contract.functions.obtenerProximoTokenId().call()
+        # Test contract functions (batched into a single round trip)
+        contract_name, contract_symbol, next_token_id = call_views(
+            web3,
+            contract,
+            [("name", ()), ("symbol", ()), ("obtenerProximoTokenId", ())],
+        )
 
         print(f"✅ Contract connected: {contract_name} ({contract_symbol})")
         print(f"✅ Contract address: {contract_address}")
@@ -108,8 +158,8 @@ def check_configuration():
 
     # Check account
     try:
-        private_key = os.getenv("PRIVATE_KEY")
-        if private_key == "your_private_key_here_without_0x_prefix":
+        private_key = env["PRIVATE_KEY"]
+        if private_key == PLACEHOLDER_PRIVATE_KEY:
             print("⚠️  Using placeholder private key - replace with actual key")
         else:
             account = web3.eth.account.from_key(private_key)
@@ -131,11 +181,11 @@ def check_configuration():
 def main():
     """Main function"""
     print("🧪 NFT Backend Configuration Check")
-    print("=" * 50)
+    print(SEPARATOR)
 
     success = check_configuration()
 
-    print("\n" + "=" * 50)
+    print("\n" + SEPARATOR)
     if success:
         print("🎉 Configuration check passed! Backend is ready to use.")
         print("\nNext steps:")
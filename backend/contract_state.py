@@ -0,0 +1,255 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+from multicall import multicall_view
+
+# Dirección que devuelve el contrato para servicios sin acompañante
+ZERO_ADDR = "0x0000000000000000000000000000000000000000"
+
+# Estado con el que se crea todo servicio
+ESTADO_CREADO = 1
+
+
+class NonceManager:
+    """Asigna nonces en memoria para la cuenta ejecutora
+
+    Evita consultar get_transaction_count en cada transacción. Se sincroniza
+    con la cadena (incluyendo pendientes) al primer uso, tras un fallo y cada
+    ``resync_interval`` segundos.
+    """
+
+    def __init__(self, web3, address: str, resync_interval: float = 60):
+        self.web3 = web3
+        self.address = address
+        self.resync_interval = resync_interval
+        self._lock = threading.Lock()
+        self._nonce = None
+        self._synced_at = 0.0
+
+    def next_nonce(self) -> int:
+        """Reserva el siguiente nonce"""
+        with self._lock:
+            now = time.monotonic()
+            if self._nonce is None or now - self._synced_at > self.resync_interval:
+                self._nonce = self.web3.eth.get_transaction_count(
+                    self.address, "pending"
+                )
+                self._synced_at = now
+
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def resync(self):
+        """Fuerza a leer el nonce de la cadena en la próxima reserva"""
+        with self._lock:
+            self._nonce = None
+
+
+class ViewCache:
+    """Caché TTL acotada para funciones view del contrato que reciben un tokenId
+
+    Las transacciones invalidan las entradas del token que modifican. Un
+    contador de generación evita guardar lecturas iniciadas antes de invalidar.
+    """
+
+    def __init__(self, contract, maxsize: int, ttl: float):
+        self.contract = contract
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # (función, tokenId) -> (expira, valor)
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def call(self, fn_name: str, token_id: int):
+        """Llama a la función view, reutilizando un resultado reciente"""
+        key = (fn_name, token_id)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            generation = self._generation
+
+        value = getattr(self.contract.functions, fn_name)(token_id).call()
+
+        with self._lock:
+            if generation == self._generation:
+                self._data[key] = (time.monotonic() + self.ttl, value)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, token_id: int = None):
+        """Descarta las entradas de un token, o todas si no se indica"""
+        with self._lock:
+            self._generation += 1
+            if token_id is None:
+                self._data.clear()
+            else:
+                for key in [key for key in self._data if key[1] == token_id]:
+                    del self._data[key]
+
+
+class ServiceStateIndex:
+    """Conteo por estado y propietarios de servicios, mantenidos por eventos
+
+    Se inicializa con un barrido Multicall3 fijado a un bloque y después solo
+    aplica los eventos ServicioCreado, EstadoCambiado y Transfer de los bloques
+    nuevos. ``event_topics`` asocia cada nombre de evento con su topic0. Si no
+    sincroniza con éxito durante ``max_age`` segundos deja de responder, para
+    que los llamadores consulten el contrato; tampoco responde hasta aplicar
+    el bloque indicado con ``require_block`` tras una transacción propia.
+    """
+
+    EVENTS = ("ServicioCreado", "EstadoCambiado", "Transfer")
+
+    def __init__(
+        self,
+        web3,
+        contract,
+        event_topics: Dict[str, bytes],
+        estados: Iterable[int],
+        block_range: int,
+        max_age: float = 60,
+    ):
+        self.web3 = web3
+        self.contract = contract
+        self.estados = tuple(estados)
+        self.block_range = block_range
+        self.max_age = max_age
+        # topic0 -> (nombre, evento del contrato para decodificar)
+        self._events = {
+            event_topics[name]: (name, getattr(contract.events, name)())
+            for name in self.EVENTS
+        }
+        self._lock = threading.Lock()
+        self._conteo = None  # estado -> número de servicios
+        self._total_creados = 0
+        self._tokens_por_propietario = {}  # propietario -> set de tokenIds
+        self._last_block = None
+        self._synced_at = 0.0
+        self._required_block = 0
+
+    def snapshot(self):
+        """Devuelve (total creados, conteo por estado), o None si no está listo
+        o lleva más de ``max_age`` segundos sin sincronizar"""
+        with self._lock:
+            if not self._is_fresh():
+                return None
+            return self._total_creados, dict(self._conteo)
+
+    def tokens_of(self, owner: str):
+        """tokenIds del propietario en orden, o None si no está listo o está
+        desactualizado"""
+        with self._lock:
+            if not self._is_fresh():
+                return None
+            return sorted(self._tokens_por_propietario.get(owner, ()))
+
+    def sync(self):
+        """Inicializa el índice o aplica los eventos hasta el último bloque
+
+        Cada rango de bloques se aplica completo o no se aplica: si un log no
+        se puede decodificar, el rango se reintenta en la siguiente llamada.
+        """
+        latest = self.web3.eth.block_number
+        if self._last_block is None:
+            self._seed(latest)
+            return
+
+        topics = [[self.web3.to_hex(topic) for topic in self._events]]
+        start = self._last_block + 1
+        while start <= latest:
+            end = min(start + self.block_range - 1, latest)
+            logs = self.web3.eth.get_logs(
+                {
+                    "address": self.contract.address,
+                    "fromBlock": start,
+                    "toBlock": end,
+                    "topics": topics,
+                }
+            )
+            deltas = [self._decode(log) for log in logs]
+            with self._lock:
+                for delta in deltas:
+                    self._apply(delta)
+                self._last_block = end
+            start = end + 1
+
+        with self._lock:
+            self._synced_at = time.monotonic()
+
+    def require_block(self, block_number: int):
+        """Exige haber aplicado ``block_number`` antes de volver a responder"""
+        with self._lock:
+            self._required_block = max(self._required_block, block_number)
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._conteo is not None
+            and self._last_block >= self._required_block
+            and time.monotonic() - self._synced_at <= self.max_age
+        )
+
+    def _seed(self, block: int):
+        total = self.contract.functions.obtenerProximoTokenId().call(
+            block_identifier=block
+        )
+        llamadas = [("obtenerEstadoServicio", (token_id,)) for token_id in range(total)]
+        llamadas += [("ownerOf", (token_id,)) for token_id in range(total)]
+        resultados = multicall_view(
+            self.web3, self.contract, llamadas, block_identifier=block
+        )
+        estados, propietarios = resultados[:total], resultados[total:]
+
+        conteo = {estado: 0 for estado in self.estados}
+        for estado in estados:
+            if estado in conteo:
+                conteo[estado] += 1
+
+        tokens_por_propietario = {}
+        for token_id, propietario in enumerate(propietarios):
+            if propietario is not None:
+                tokens_por_propietario.setdefault(propietario, set()).add(token_id)
+
+        with self._lock:
+            self._conteo = conteo
+            self._total_creados = total
+            self._tokens_por_propietario = tokens_por_propietario
+            self._last_block = block
+            self._synced_at = time.monotonic()
+
+    def _decode(self, log) -> tuple:
+        """Convierte un log en una diferencia a aplicar; valida antes de aplicar"""
+        name, event = self._events[log["topics"][0]]
+        if name == "ServicioCreado":
+            return (name,)
+
+        args = event.process_log(log)["args"]
+        if name == "EstadoCambiado":
+            anterior, nuevo = args["estadoAnterior"], args["nuevoEstado"]
+            if anterior not in self.estados or nuevo not in self.estados:
+                raise ValueError(f"Estado desconocido en EstadoCambiado: {dict(args)}")
+            return (name, anterior, nuevo)
+
+        return (name, args["tokenId"], args["from"], args["to"])
+
+    def _apply(self, delta: tuple):
+        # El conteo es una suma de diferencias; los Transfer se aplican en el
+        # orden de eth_getLogs (bloque, índice de log)
+        name = delta[0]
+        if name == "ServicioCreado":
+            self._total_creados += 1
+            self._conteo[ESTADO_CREADO] += 1
+        elif name == "EstadoCambiado":
+            _, anterior, nuevo = delta
+            self._conteo[anterior] -= 1
+            self._conteo[nuevo] += 1
+        else:
+            _, token_id, origen, destino = delta
+            self._tokens_por_propietario.get(origen, set()).discard(token_id)
+            if destino != ZERO_ADDR:
+                self._tokens_por_propietario.setdefault(destino, set()).add(token_id)
@@ -1,16 +1,58 @@
+import asyncio
+import atexit
 import json
+import logging
 import os
-
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+
+import requests
+from abi_cache import load_contract_abi
+from contract_state import ZERO_ADDR, NonceManager, ServiceStateIndex, ViewCache
 from dotenv import load_dotenv
 from eth_account import Account
-from fastapi import FastAPI, HTTPException
+from eth_utils import event_abi_to_log_topic
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from hexbytes import HexBytes
+from multicall import call_views, multicall_view
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 from transaction_logger import log_transaction
+from urllib3.util.retry import Retry
 from web3 import Web3
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+try:
+    import orjson  # ORJSONResponse lo requiere; es opcional
+
+    # Solo para respuestas sin enteros de más de 64 bits (orjson no los admite)
+    StatsJSONResponse = ORJSONResponse
+except ImportError:
+    orjson = None
+    StatsJSONResponse = JSONResponse
 
 load_dotenv()
 
+# Trazas por petición en DEBUG; LOG_LEVEL=DEBUG las activa. Los registros se
+# encolan y un hilo aparte los escribe en stderr, fuera del event loop
+_log_records = queue.SimpleQueue()
+_log_listener = QueueListener(_log_records, logging.StreamHandler())
+logging.basicConfig(
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    handlers=[QueueHandler(_log_records)],
+)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="NFT Servicios API - Refactorizado",
     description="API simplificada para gestionar NFTs de servicios de acompañamiento (3 estados)",
@@ -31,6 +73,47 @@ PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 RPC_URL = os.getenv("RPC_URL", "https://sepolia-rollup.arbitrum.io/rpc")
 CHAIN_ID = int(os.getenv("CHAIN_ID", "421614"))
 
+# Espera de recibos: primer intervalo configurable, backoff hasta el máximo
+TX_POLL_LATENCY = float(os.getenv("TX_POLL_LATENCY", "1.0"))
+TX_POLL_MAX_LATENCY = 4.0
+TX_RECEIPT_TIMEOUT = 120
+
+# Segundos durante los que se reutiliza el gas price consultado
+GAS_PRICE_TTL = 5.0
+
+# Caché de funciones view por token: vida en segundos y número de entradas
+VIEW_CACHE_TTL = 5.0
+VIEW_CACHE_MAXSIZE = 4096
+# Los clientes pueden reutilizar las respuestas por token durante el mismo TTL
+VIEW_CACHE_CONTROL = f"private, max-age={int(VIEW_CACHE_TTL)}"
+
+# Índice de estados por eventos: intervalo de sondeo (s) y bloques por eth_getLogs
+STATE_INDEX_POLL_INTERVAL = 5.0
+STATE_INDEX_MAX_POLL_INTERVAL = 60.0
+# Sin una sincronización correcta en este tiempo (s) se consulta el contrato
+STATE_INDEX_MAX_AGE = 15.0
+LOGS_BLOCK_RANGE = int(os.getenv("LOGS_BLOCK_RANGE", "10000"))
+
+# Límites de gas fijos por función (~2x el máximo observado en transfer_log.json).
+# En Arbitrum el gas incluye el coste de datos en L1, que fluctúa, así que solo
+# reemplazan a estimate_gas si SKIP_GAS_ESTIMATE=1
+SKIP_GAS_ESTIMATE = os.getenv("SKIP_GAS_ESTIMATE") == "1"
+GAS_LIMITS = {
+    "crearServicio": 300_000,
+    "asignarAcompanante": 150_000,
+    "cambiarEstadoServicio": 200_000,
+    "finalizarServicio": 200_000,
+    "configurarURIEstado": 200_000,
+}
+
+# Estados del servicio; también define los valores válidos
+ESTADOS_SERVICIO = {1: "CREADO", 2: "ENCONTRADO", 3: "FINALIZADO"}
+
+# FAST_ENCODE=1 codifica las transacciones con selectores precalculados en lugar
+# de pasar por ContractFunction.build_transaction
+FAST_ENCODE = os.getenv("FAST_ENCODE") == "1"
+
+
 # Cargar dirección del contrato desde despliegue
 deployment_file = os.path.join(
     os.path.dirname(__file__), "..", "deployments", "latest-deployment.json"
@@ -39,14 +122,28 @@ with open(deployment_file, "r") as f:
     deployment_info = json.load(f)
     CONTRACT_ADDRESS = deployment_info["contractAddress"]
 
-# Inicializar Web3
-web3 = Web3(Web3.HTTPProvider(RPC_URL))
+# Inicializar Web3 con una sesión keep-alive cuyo pool cubre todos los hilos
+# que pueden consultar el nodo a la vez (límite por defecto del threadpool)
+RPC_POOL_SIZE = 40
+rpc_session = requests.Session()
+# Solo se reintentan fallos de conexión: la petición no llegó al nodo, así que
+# es seguro incluso para eth_sendRawTransaction
+rpc_adapter = HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=RPC_POOL_SIZE,
+    max_retries=Retry(
+        total=3, connect=3, read=0, status=0, other=0, backoff_factor=0.2
+    ),
+)
+rpc_session.mount("https://", rpc_adapter)
+rpc_session.mount("http://", rpc_adapter)
+web3 = Web3(Web3.HTTPProvider(RPC_URL, session=rpc_session))
 
 # Validar conexión
 if not web3.is_connected():
     raise ConnectionError("No se pudo conectar a la red Arbitrum")
 else:
-    print(f"🌐 Conectado a Arbitrum Sepolia - Block: {web3.eth.block_number}")
+    logger.info("🌐 Conectado a Arbitrum Sepolia - Block: %s", web3.eth.block_number)
 
 # Cargar ABI desde artifacts de Hardhat
 try:
@@ -58,9 +155,7 @@ try:
         "ColeccionServiciosNFT.sol",
         "ColeccionServiciosNFT.json",
     )
-    with open(artifact_path, "r") as f:
-        artifact = json.load(f)
-        CONTRACT_ABI = artifact["abi"]
+    CONTRACT_ABI = load_contract_abi(artifact_path)
 except FileNotFoundError:
     raise FileNotFoundError(
         f"No se encontró el ABI del contrato en {artifact_path}. "
@@ -72,14 +167,65 @@ contract = web3.eth.contract(
     address=Web3.to_checksum_address(CONTRACT_ADDRESS), abi=CONTRACT_ABI
 )
 
+# Eventos del contrato, construidos una sola vez para decodificar recibos
+EVT_SERVICIO_CREADO = contract.events.ServicioCreado()
+EVT_ESTADO_CAMBIADO = contract.events.EstadoCambiado()
+EVT_ACOMPANANTE_ASIGNADO = contract.events.AcompananteAsignado()
+
+
+def _event_topic(name: str) -> HexBytes:
+    """topic0 del evento a partir de su entrada en el ABI del contrato"""
+    for entry in contract.abi:
+        if entry.get("type") == "event" and entry.get("name") == name:
+            return HexBytes(event_abi_to_log_topic(entry))
+    raise ValueError(f"Evento {name} no encontrado en el ABI")
+
+
+TOPIC_SERVICIO_CREADO = _event_topic("ServicioCreado")
+TOPIC_ESTADO_CAMBIADO = _event_topic("EstadoCambiado")
+TOPIC_TRANSFER = _event_topic("Transfer")
+TOPIC_ACOMPANANTE_ASIGNADO = _event_topic("AcompananteAsignado")
+EVENT_TOPICS = {
+    "ServicioCreado": TOPIC_SERVICIO_CREADO,
+    "EstadoCambiado": TOPIC_ESTADO_CAMBIADO,
+    "AcompananteAsignado": TOPIC_ACOMPANANTE_ASIGNADO,
+    "Transfer": TOPIC_TRANSFER,
+}
+
+# Funciones del contrato resueltas una vez; cada llamada con argumentos crea
+# una copia, así que reutilizarlas es seguro
+FN_CREAR_SERVICIO = contract.functions.crearServicio
+FN_ASIGNAR_ACOMPANANTE = contract.functions.asignarAcompanante
+FN_CAMBIAR_ESTADO_SERVICIO = contract.functions.cambiarEstadoServicio
+FN_FINALIZAR_SERVICIO = contract.functions.finalizarServicio
+FN_CONFIGURAR_URI_ESTADO = contract.functions.configurarURIEstado
+FN_OBTENER_PROXIMO_TOKEN_ID = contract.functions.obtenerProximoTokenId
+FN_OBTENER_ESTADO_SERVICIO = contract.functions.obtenerEstadoServicio
+FN_OBTENER_SERVICIOS_CON_ESTADOS = contract.functions.obtenerServiciosConEstados
+
+# Selector y tipos de argumentos de las funciones de escritura, para FAST_ENCODE.
+# Ninguna está sobrecargada ni recibe tuplas, así que la firma es nombre(tipos)
+CALL_SIGNATURES = {}
+for _fn_abi in CONTRACT_ABI:
+    if _fn_abi["type"] == "function" and _fn_abi["name"] in (
+        "crearServicio",
+        "asignarAcompanante",
+        "cambiarEstadoServicio",
+        "finalizarServicio",
+        "configurarURIEstado",
+    ):
+        _types = [arg["type"] for arg in _fn_abi["inputs"]]
+        _selector = Web3.keccak(text=f"{_fn_abi['name']}({','.join(_types)})")[:4]
+        CALL_SIGNATURES[_fn_abi["name"]] = (bytes(_selector), _types)
+
 # Obtener cuenta desde clave privada
 if not PRIVATE_KEY:
     raise ValueError("PRIVATE_KEY no configurada en .env")
 
 account = web3.eth.account.from_key(PRIVATE_KEY)
 ACCOUNT_ADDRESS = account.address
-print(f"👤 Cuenta configurada: {ACCOUNT_ADDRESS}")
-print(f"📄 Contrato configurado: {CONTRACT_ADDRESS}")
+logger.info("👤 Cuenta configurada: %s", ACCOUNT_ADDRESS)
+logger.info("📄 Contrato configurado: %s", CONTRACT_ADDRESS)
 
 
 # ==================== MODELOS SIMPLIFICADOS ====================
@@ -101,38 +247,151 @@ class AsignarAcompananteRequest(BaseModel):
 
 
 # ==================== FUNCIONES AUXILIARES ====================
-def build_and_send_transaction(function_call):
-    """Construye y envía una transacción"""
-    try:
-        print(f"🔧 Estimando gas para transacción...")
-        nonce = web3.eth.get_transaction_count(ACCOUNT_ADDRESS)
-        print(f"📝 Nonce obtenido: {nonce}")
+@lru_cache(maxsize=2048)
+def checksum_address(address: str) -> str:
+    """Web3.to_checksum_address con caché; el checksum EIP-55 requiere un keccak"""
+    return Web3.to_checksum_address(address)
+
+
+nonce_manager = NonceManager(web3, ACCOUNT_ADDRESS)
+view_cache = ViewCache(contract, VIEW_CACHE_MAXSIZE, VIEW_CACHE_TTL)
+state_index = ServiceStateIndex(
+    web3,
+    contract,
+    EVENT_TOPICS,
+    ESTADOS_SERVICIO,
+    LOGS_BLOCK_RANGE,
+    max_age=STATE_INDEX_MAX_AGE,
+)
 
-        gas_estimate = function_call.estimate_gas({"from": ACCOUNT_ADDRESS})
-        print(f"⛽ Gas estimado: {gas_estimate}")
 
-        gas_price = web3.eth.gas_price
-        print(f"💰 Gas price: {gas_price}")
+@lru_cache(maxsize=1)
+def contract_metadata() -> tuple:
+    """(name, symbol) del contrato; son inmutables, se consultan una sola vez"""
+    return tuple(call_views(web3, contract, [("name", ()), ("symbol", ())]))
 
-        tx_dict = function_call.build_transaction(
-            {
-                "nonce": nonce,
-                "gas": int(gas_estimate * 1.2),
-                "gasPrice": gas_price,
-                "from": ACCOUNT_ADDRESS,
-                "chainId": CHAIN_ID,
-            }
+
+_gas_price_lock = threading.Lock()
+_gas_price = None
+_gas_price_ts = 0.0
+# Consulta el gas price mientras el hilo de la petición estima el gas
+_gas_price_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gas-price")
+
+
+def get_gas_price() -> int:
+    """Gas price de la red, reutilizado durante GAS_PRICE_TTL segundos"""
+    global _gas_price, _gas_price_ts
+
+    with _gas_price_lock:
+        now = time.monotonic()
+        if _gas_price is None or now - _gas_price_ts >= GAS_PRICE_TTL:
+            _gas_price = web3.eth.gas_price
+            _gas_price_ts = now
+        return _gas_price
+
+
+def wait_for_receipt(tx_hash, timeout: float = TX_RECEIPT_TIMEOUT):
+    """Espera el recibo de una transacción con backoff exponencial"""
+    deadline = time.monotonic() + timeout
+    delay = TX_POLL_LATENCY
+
+    while True:
+        try:
+            return web3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            pass
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeExhausted(
+                f"Transacción {tx_hash.hex()} sin recibo tras {timeout} segundos"
+            )
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 1.5, TX_POLL_MAX_LATENCY)
+
+
+def decode_receipt_events(event, receipt) -> list:
+    """Decodifica del recibo solo los logs del contrato con el topic del evento
+
+    process_receipt intenta decodificar todos los logs (p. ej. los Transfer) y
+    emite un aviso por cada uno que no coincide.
+    """
+    topic = EVENT_TOPICS[event.event_name]
+    return [
+        event.process_log(log)
+        for log in receipt["logs"]
+        if log["topics"]
+        and log["topics"][0] == topic
+        and log["address"] == contract.address
+    ]
+
+
+def encode_call(function_call):
+    """Calldata de una función de escritura con su selector precalculado
+
+    Retorna None si la función no está en CALL_SIGNATURES.
+    """
+    signature = CALL_SIGNATURES.get(function_call.fn_name)
+    if signature is None:
+        return None
+    selector, types = signature
+    return selector + web3.codec.encode(types, function_call.args)
+
+
+def build_and_send_transaction(function_call):
+    """Construye y envía una transacción
+
+    Retorna el resumen de la transacción y el recibo, para decodificar eventos
+    sin volver a pedirlo al nodo.
+    """
+    try:
+        # Gas price y estimación en paralelo: un RTT en lugar de dos. Si la
+        # estimación revierte, su error se propaga tal cual
+        gas_price_future = _gas_price_executor.submit(get_gas_price)
+
+        call_data = encode_call(function_call) if FAST_ENCODE else None
+        tx_params = {"from": ACCOUNT_ADDRESS}
+        if call_data is not None:
+            tx_params.update(to=contract.address, data=call_data, value=0)
+
+        gas_limit = GAS_LIMITS.get(function_call.fn_name) if SKIP_GAS_ESTIMATE else None
+        if gas_limit is None:
+            logger.debug("🔧 Estimando gas para transacción...")
+            if call_data is None:
+                gas_estimate = function_call.estimate_gas(tx_params)
+            else:
+                gas_estimate = web3.eth.estimate_gas(tx_params)
+            logger.debug("⛽ Gas estimado: %s", gas_estimate)
+            gas_limit = int(gas_estimate * 1.2)
+        else:
+            logger.debug("⛽ Límite de gas fijo: %s", gas_limit)
+
+        gas_price = gas_price_future.result()
+        logger.debug("💰 Gas price: %s", gas_price)
+
+        # Se reserva al final para no dejar huecos si falla la estimación
+        nonce = nonce_manager.next_nonce()
+        logger.debug("📝 Nonce asignado: %s", nonce)
+
+        tx_params.update(
+            nonce=nonce, gas=gas_limit, gasPrice=gas_price, chainId=CHAIN_ID
         )
-        print(f"📄 Transacción construida: {tx_dict}")
+        if call_data is None:
+            tx_dict = function_call.build_transaction(tx_params)
+        else:
+            tx_dict = tx_params
+        logger.debug("📄 Transacción construida: %s", tx_dict)
 
-        signed_tx = web3.eth.account.sign_transaction(tx_dict, PRIVATE_KEY)
-        print(f"✍️ Transacción firmada")
+        # LocalAccount ya tiene la clave decodificada; no se procesa el hex cada vez
+        signed_tx = account.sign_transaction(tx_dict)
+        logger.debug("✍️ Transacción firmada")
 
         tx_hash = web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        print(f"📤 Transacción enviada: {tx_hash.hex()}")
+        logger.debug("📤 Transacción enviada: %s", tx_hash.hex())
 
-        receipt = web3.eth.wait_for_transaction_receipt(tx_hash)
-        print(f"✅ Recibo obtenido: {receipt}")
+        receipt = wait_for_receipt(tx_hash)
+        logger.debug("✅ Recibo obtenido: %s", receipt)
 
         tx_result = {
             "transactionHash": tx_hash.hex(),
@@ -141,13 +400,97 @@ def build_and_send_transaction(function_call):
             "status": receipt["status"],
         }
 
-        return tx_result
+        return tx_result, receipt
     except Exception as e:
-        print(f"❌ Error en build_and_send_transaction: {str(e)}")
-        print(f"🔍 Tipo de error: {type(e).__name__}")
+        # El nonce local puede no coincidir con la cadena tras un fallo
+        nonce_manager.resync()
+        logger.error("❌ Error en build_and_send_transaction: %s", e)
+        logger.error("🔍 Tipo de error: %s", type(e).__name__)
         raise HTTPException(status_code=400, detail=f"Error en transacción: {str(e)}")
 
 
+# ==================== REGISTRO DE TRANSACCIONES ====================
+# Las escrituras del log se sacan de la respuesta: un único consumidor las
+# aplica en orden, sin lecturas-escrituras concurrentes sobre el archivo
+log_queue = None
+
+
+async def _log_writer():
+    """Consume la cola y escribe cada transacción en el log"""
+    while True:
+        entry = await log_queue.get()
+        try:
+            await run_in_threadpool(_registrar_transaccion, entry)
+        finally:
+            log_queue.task_done()
+
+
+@app.on_event("startup")
+async def iniciar_log_writer():
+    global log_queue
+    log_queue = asyncio.Queue()
+    app.state.log_writer = asyncio.create_task(_log_writer())
+
+
+def _log_writer_activo() -> bool:
+    writer = getattr(app.state, "log_writer", None)
+    return log_queue is not None and writer is not None and not writer.done()
+
+
+def _registrar_transaccion(entry: dict):
+    try:
+        log_transaction(**entry)
+    except Exception as e:
+        logger.error("❌ Error registrando transacción: %s", e)
+
+
+@app.on_event("shutdown")
+async def detener_log_writer():
+    if not _log_writer_activo():
+        # Sin consumidor, join() no terminaría: escribir lo pendiente aquí
+        while log_queue is not None and not log_queue.empty():
+            _registrar_transaccion(log_queue.get_nowait())
+        return
+    # Vaciar los registros pendientes antes de salir
+    await log_queue.join()
+    app.state.log_writer.cancel()
+
+
+def enqueue_log_transaction(**entry):
+    """Encola una transacción para registrarla en segundo plano
+
+    Si el consumidor no está en marcha (sin evento startup o caído), la
+    transacción ya se minó y no debe perderse: se registra en el momento.
+    """
+    if _log_writer_activo():
+        log_queue.put_nowait(entry)
+    else:
+        _registrar_transaccion(entry)
+
+
+async def _state_index_updater():
+    """Mantiene sincronizado el índice de estados; espera más tras cada error"""
+    interval = STATE_INDEX_POLL_INTERVAL
+    while True:
+        try:
+            await run_in_threadpool(state_index.sync)
+            interval = STATE_INDEX_POLL_INTERVAL
+        except Exception as e:
+            logger.warning("⚠️ Error sincronizando índice de estados: %s", e)
+            interval = min(interval * 2, STATE_INDEX_MAX_POLL_INTERVAL)
+        await asyncio.sleep(interval)
+
+
+@app.on_event("startup")
+async def iniciar_indice_estados():
+    app.state.state_index_updater = asyncio.create_task(_state_index_updater())
+
+
+@app.on_event("shutdown")
+async def detener_indice_estados():
+    app.state.state_index_updater.cancel()
+
+
 # ==================== ENDPOINTS - GESTIÓN DE SERVICIOS ====================
 @app.post("/servicios/crear")
 async def crear_servicio(request: CrearServicioRequest):
@@ -161,26 +504,31 @@ async def crear_servicio(request: CrearServicioRequest):
     - **Retorna**: tokenId, destinatario, estado, información de transacción
     """
     try:
-        print(f"🎯 Iniciando creación de servicio para: {request.destinatario}")
-        destinatario = Web3.to_checksum_address(request.destinatario)
-        print(f"✅ Dirección validada: {destinatario}")
+        logger.debug("🎯 Iniciando creación de servicio para: %s", request.destinatario)
+        destinatario = checksum_address(request.destinatario)
+        logger.debug("✅ Dirección validada: %s", destinatario)
 
-        function = contract.functions.crearServicio(destinatario)
-        print(f"📋 Función del contrato preparada")
+        function = FN_CREAR_SERVICIO(destinatario)
+        logger.debug("📋 Función del contrato preparada")
 
-        tx_result = build_and_send_transaction(function)
-        print(f"✅ Transacción completada: {tx_result}")
+        tx_result, receipt = await run_in_threadpool(
+            build_and_send_transaction, function
+        )
+        logger.debug("✅ Transacción completada: %s", tx_result)
 
         # Obtener tokenId del evento
-        receipt = web3.eth.get_transaction_receipt(tx_result["transactionHash"])
-        logs = contract.events.ServicioCreado().process_receipt(receipt)
-        print(f"📊 Logs del evento: {logs}")
+        logs = decode_receipt_events(EVT_SERVICIO_CREADO, receipt)
+        logger.debug("📊 Logs del evento: %s", logs)
 
         token_id = logs[0]["args"]["tokenId"] if logs else None
-        print(f"🎫 Token ID obtenido: {token_id}")
+        logger.debug("🎫 Token ID obtenido: %s", token_id)
+        if token_id is not None:
+            view_cache.invalidate(token_id)
+        # Las lecturas por el índice esperan a que incluya este bloque
+        state_index.require_block(tx_result["blockNumber"])
 
         # Registrar transacción en el log
-        log_transaction(
+        enqueue_log_transaction(
             tx_hash=tx_result["transactionHash"],
             function_name="crearServicio",
             parameters={"destinatario": destinatario},
@@ -197,8 +545,8 @@ async def crear_servicio(request: CrearServicioRequest):
             "transaction": tx_result,
         }
     except Exception as e:
-        print(f"❌ Error en crear_servicio: {str(e)}")
-        print(f"🔍 Tipo de error: {type(e).__name__}")
+        logger.error("❌ Error en crear_servicio: %s", e)
+        logger.error("🔍 Tipo de error: %s", type(e).__name__)
         raise HTTPException(
             status_code=400, detail=f"Error al crear servicio: {str(e)}"
         )
@@ -217,22 +565,25 @@ async def asignar_acompanante(tokenId: int, request: AsignarAcompananteRequest):
     - **Retorna**: tokenId, acompañante, estado, información de transacción
     """
     try:
-        print(f"🎯 Asignando acompañante {request.acompanante} al token {tokenId}")
-        acompanante = Web3.to_checksum_address(request.acompanante)
-        print(f"✅ Dirección validada: {acompanante}")
+        logger.debug(
+            "🎯 Asignando acompañante %s al token %s", request.acompanante, tokenId
+        )
+        acompanante = checksum_address(request.acompanante)
+        logger.debug("✅ Dirección validada: %s", acompanante)
 
-        function = contract.functions.asignarAcompanante(tokenId, acompanante)
-        tx_result = build_and_send_transaction(function)
+        function = FN_ASIGNAR_ACOMPANANTE(tokenId, acompanante)
+        tx_result, receipt = await run_in_threadpool(
+            build_and_send_transaction, function
+        )
+        view_cache.invalidate(tokenId)
+        state_index.require_block(tx_result["blockNumber"])
 
         # Obtener eventos
-        receipt = web3.eth.get_transaction_receipt(tx_result["transactionHash"])
-        estado_logs = contract.events.EstadoCambiado().process_receipt(receipt)
-        acompanante_logs = contract.events.AcompananteAsignado().process_receipt(
-            receipt
-        )
+        estado_logs = decode_receipt_events(EVT_ESTADO_CAMBIADO, receipt)
+        acompanante_logs = decode_receipt_events(EVT_ACOMPANANTE_ASIGNADO, receipt)
 
         # Registrar transacción en el log
-        log_transaction(
+        enqueue_log_transaction(
             tx_hash=tx_result["transactionHash"],
             function_name="asignarAcompanante",
             parameters={"tokenId": tokenId, "acompanante": acompanante},
@@ -250,7 +601,7 @@ async def asignar_acompanante(tokenId: int, request: AsignarAcompananteRequest):
             "transaction": tx_result,
         }
     except Exception as e:
-        print(f"❌ Error en asignar_acompanante: {str(e)}")
+        logger.error("❌ Error en asignar_acompanante: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -268,26 +619,27 @@ async def cambiar_estado_servicio(tokenId: int, request: CambiarEstadoRequest):
     - **Retorna**: estado anterior, nuevo estado, información de transacción
     """
     try:
-        if request.nuevoEstado not in [1, 2, 3]:
+        if request.nuevoEstado not in ESTADOS_SERVICIO:
             raise ValueError("Estado debe ser 1, 2 o 3")
 
-        print(f"🎯 Cambiando estado del token {tokenId} a {request.nuevoEstado}")
+        logger.debug(
+            "🎯 Cambiando estado del token %s a %s", tokenId, request.nuevoEstado
+        )
 
-        function = contract.functions.cambiarEstadoServicio(
-            tokenId, request.nuevoEstado
+        function = FN_CAMBIAR_ESTADO_SERVICIO(tokenId, request.nuevoEstado)
+        tx_result, receipt = await run_in_threadpool(
+            build_and_send_transaction, function
         )
-        tx_result = build_and_send_transaction(function)
+        view_cache.invalidate(tokenId)
+        state_index.require_block(tx_result["blockNumber"])
 
         # Obtener eventos
-        receipt = web3.eth.get_transaction_receipt(tx_result["transactionHash"])
-        logs = contract.events.EstadoCambiado().process_receipt(receipt)
+        logs = decode_receipt_events(EVT_ESTADO_CAMBIADO, receipt)
 
         estado_anterior = logs[0]["args"]["estadoAnterior"] if logs else None
 
-        estados_map = {1: "CREADO", 2: "ENCONTRADO", 3: "FINALIZADO"}
-
         # Registrar transacción en el log
-        log_transaction(
+        enqueue_log_transaction(
             tx_hash=tx_result["transactionHash"],
             function_name="cambiarEstadoServicio",
             parameters={
@@ -306,13 +658,17 @@ async def cambiar_estado_servicio(tokenId: int, request: CambiarEstadoRequest):
             "success": True,
             "tokenId": tokenId,
             "estadoAnterior": estado_anterior,
-            "estadoAnteriorNombre": estados_map.get(estado_anterior, "DESCONOCIDO"),
+            "estadoAnteriorNombre": ESTADOS_SERVICIO.get(
+                estado_anterior, "DESCONOCIDO"
+            ),
             "nuevoEstado": request.nuevoEstado,
-            "nuevoEstadoNombre": estados_map.get(request.nuevoEstado, "DESCONOCIDO"),
+            "nuevoEstadoNombre": ESTADOS_SERVICIO.get(
+                request.nuevoEstado, "DESCONOCIDO"
+            ),
             "transaction": tx_result,
         }
     except Exception as e:
-        print(f"❌ Error en cambiar_estado_servicio: {str(e)}")
+        logger.error("❌ Error en cambiar_estado_servicio: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -327,13 +683,15 @@ async def finalizar_servicio(tokenId: int):
     - **Gasta gas** - Transacción en blockchain
     """
     try:
-        print(f"🎯 Finalizando servicio {tokenId}")
+        logger.debug("🎯 Finalizando servicio %s", tokenId)
 
-        function = contract.functions.finalizarServicio(tokenId)
-        tx_result = build_and_send_transaction(function)
+        function = FN_FINALIZAR_SERVICIO(tokenId)
+        tx_result, _ = await run_in_threadpool(build_and_send_transaction, function)
+        view_cache.invalidate(tokenId)
+        state_index.require_block(tx_result["blockNumber"])
 
         # Registrar transacción
-        log_transaction(
+        enqueue_log_transaction(
             tx_hash=tx_result["transactionHash"],
             function_name="finalizarServicio",
             parameters={"tokenId": tokenId},
@@ -349,13 +707,13 @@ async def finalizar_servicio(tokenId: int):
             "transaction": tx_result,
         }
     except Exception as e:
-        print(f"❌ Error en finalizar_servicio: {str(e)}")
+        logger.error("❌ Error en finalizar_servicio: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 # ==================== ENDPOINTS - CONSULTAS ====================
 @app.get("/servicios/{tokenId}/estado")
-async def obtener_estado_servicio(tokenId: int):
+async def obtener_estado_servicio(tokenId: int, response: Response):
     """
     Obtener Estado del Servicio
 
@@ -365,23 +723,21 @@ async def obtener_estado_servicio(tokenId: int):
     - **Retorna**: estado numérico (1-3) y nombre del estado
     """
     try:
-        estado = contract.functions.obtenerEstadoServicio(tokenId).call()
-        estados_map = {
-            1: "CREADO",
-            2: "ENCONTRADO",
-            3: "FINALIZADO",
-        }
+        estado = await run_in_threadpool(
+            view_cache.call, "obtenerEstadoServicio", tokenId
+        )
+        response.headers["Cache-Control"] = VIEW_CACHE_CONTROL
         return {
             "tokenId": tokenId,
             "estado": estado,
-            "estadoNombre": estados_map.get(estado, "DESCONOCIDO"),
+            "estadoNombre": ESTADOS_SERVICIO.get(estado, "DESCONOCIDO"),
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/servicios/{tokenId}/acompanante")
-async def obtener_acompanante(tokenId: int):
+async def obtener_acompanante(tokenId: int, response: Response):
     """
     Obtener Acompañante Asignado
 
@@ -389,19 +745,20 @@ async def obtener_acompanante(tokenId: int):
     - **Retorna**: dirección del acompañante asignado
     """
     try:
-        acompanante = contract.functions.obtenerAcompanante(tokenId).call()
+        acompanante = await run_in_threadpool(
+            view_cache.call, "obtenerAcompanante", tokenId
+        )
+        response.headers["Cache-Control"] = VIEW_CACHE_CONTROL
         return {
             "tokenId": tokenId,
-            "acompanante": acompanante
-            if acompanante != "0x0000000000000000000000000000000000000000"
-            else None,
+            "acompanante": acompanante if acompanante != ZERO_ADDR else None,
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/servicios/{tokenId}/uri")
-async def obtener_uri_servicio(tokenId: int):
+async def obtener_uri_servicio(tokenId: int, response: Response):
     """
     Obtener URI del Servicio
 
@@ -409,14 +766,15 @@ async def obtener_uri_servicio(tokenId: int):
     - **URI dinámica**: Cambia según el estado del servicio
     """
     try:
-        uri = contract.functions.obtenerURIServicio(tokenId).call()
+        uri = await run_in_threadpool(view_cache.call, "obtenerURIServicio", tokenId)
+        response.headers["Cache-Control"] = VIEW_CACHE_CONTROL
         return {"tokenId": tokenId, "uri": uri}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/servicios/{tokenId}/info")
-async def obtener_info_completa(tokenId: int):
+async def obtener_info_completa(tokenId: int, response: Response):
     """
     Obtener Información Completa del Servicio
 
@@ -424,19 +782,16 @@ async def obtener_info_completa(tokenId: int):
     - **Retorna**: propietario, estado, acompañante, URI
     """
     try:
-        info = contract.functions.obtenerInfoCompleta(tokenId).call()
+        info = await run_in_threadpool(view_cache.call, "obtenerInfoCompleta", tokenId)
+        response.headers["Cache-Control"] = VIEW_CACHE_CONTROL
         propietario, estado, acompanante, uri = info
 
-        estados_map = {1: "CREADO", 2: "ENCONTRADO", 3: "FINALIZADO"}
-
         return {
             "tokenId": tokenId,
             "propietario": propietario,
             "estado": estado,
-            "estadoNombre": estados_map.get(estado, "DESCONOCIDO"),
-            "acompanante": acompanante
-            if acompanante != "0x0000000000000000000000000000000000000000"
-            else None,
+            "estadoNombre": ESTADOS_SERVICIO.get(estado, "DESCONOCIDO"),
+            "acompanante": acompanante if acompanante != ZERO_ADDR else None,
             "uri": uri,
         }
     except Exception as e:
@@ -444,7 +799,7 @@ async def obtener_info_completa(tokenId: int):
 
 
 # ==================== ENDPOINTS - ESTADÍSTICAS (NUEVOS) ====================
-@app.get("/estadisticas/{wallet}")
+@app.get("/estadisticas/{wallet}", response_class=StatsJSONResponse)
 async def obtener_estadisticas_wallet(wallet: str):
     """
     Obtener Estadísticas Completas de una Wallet
@@ -458,38 +813,32 @@ async def obtener_estadisticas_wallet(wallet: str):
     - **Sin gas** - Solo lectura
     """
     try:
-        wallet_address = Web3.to_checksum_address(wallet)
-        print(f"🔍 Consultando estadísticas para wallet: {wallet_address}")
-
-        # Obtener datos del contrato
-        result = contract.functions.obtenerServiciosConEstados(wallet_address).call()
+        wallet_address = checksum_address(wallet)
+        logger.debug("🔍 Consultando estadísticas para wallet: %s", wallet_address)
+
+        # Obtener servicios y estadísticas agregadas en un solo eth_call
+        result, stats = await run_in_threadpool(
+            call_views,
+            web3,
+            contract,
+            [
+                ("obtenerServiciosConEstados", (wallet_address,)),
+                ("obtenerEstadisticasWallet", (wallet_address,)),
+            ],
+        )
         tokenIds, estados, acompanantes = result
-
-        # Obtener estadísticas agregadas
-        stats = contract.functions.obtenerEstadisticasWallet(wallet_address).call()
         total, creados, encontrados, finalizados = stats
 
         # Construir respuesta detallada
-        servicios = []
-        estados_map = {1: "CREADO", 2: "ENCONTRADO", 3: "FINALIZADO"}
-
-        for i in range(len(tokenIds)):
-            if tokenIds[i] >= 0:  # Incluir todos los tokens válidos
-                estado_nombre = estados_map.get(estados[i], "DESCONOCIDO")
-                acompanante_clean = (
-                    acompanantes[i]
-                    if acompanantes[i] != "0x0000000000000000000000000000000000000000"
-                    else None
-                )
-
-                servicios.append(
-                    {
-                        "tokenId": int(tokenIds[i]),
-                        "estado": int(estados[i]),
-                        "estadoNombre": estado_nombre,
-                        "acompanante": acompanante_clean,
-                    }
-                )
+        servicios = [
+            {
+                "tokenId": int(token_id),
+                "estado": int(estado),
+                "estadoNombre": ESTADOS_SERVICIO.get(estado, "DESCONOCIDO"),
+                "acompanante": acompanante if acompanante != ZERO_ADDR else None,
+            }
+            for token_id, estado, acompanante in zip(tokenIds, estados, acompanantes)
+        ]
 
         return {
             "wallet": wallet_address,
@@ -510,11 +859,11 @@ async def obtener_estadisticas_wallet(wallet: str):
             },
         }
     except Exception as e:
-        print(f"❌ Error en obtener_estadisticas_wallet: {str(e)}")
+        logger.error("❌ Error en obtener_estadisticas_wallet: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/estadisticas/general/resumen")
+@app.get("/estadisticas/general/resumen", response_class=StatsJSONResponse)
 async def obtener_resumen_general():
     """
     Obtener Resumen General del Sistema
@@ -524,18 +873,39 @@ async def obtener_resumen_general():
     - **Sin gas** - Solo lectura
     """
     try:
-        print("🔍 Generando resumen general del sistema")
-        proximo_token = contract.functions.obtenerProximoTokenId().call()
-
-        # Contar estados
-        conteo_estados = {1: 0, 2: 0, 3: 0}
-        for token_id in range(proximo_token):
+        logger.debug("🔍 Generando resumen general del sistema")
+        snapshot = state_index.snapshot()
+        if snapshot is not None:
+            proximo_token, conteo_estados = snapshot
+        else:
+            # Índice sin sincronizar o desactualizado: barrido completo de estados
+            proximo_token = await run_in_threadpool(FN_OBTENER_PROXIMO_TOKEN_ID().call)
+
+            # Consultar todos los estados con Multicall3 (un eth_call por lote)
+            llamadas = [
+                ("obtenerEstadoServicio", (token_id,))
+                for token_id in range(proximo_token)
+            ]
             try:
-                estado = contract.functions.obtenerEstadoServicio(token_id).call()
+                estados = await run_in_threadpool(
+                    multicall_view, web3, contract, llamadas
+                )
+            except Exception:
+                # Red sin Multicall3: una llamada por token en paralelo; el pool de
+                # hilos limita la concurrencia
+                estados = await asyncio.gather(
+                    *(
+                        run_in_threadpool(FN_OBTENER_ESTADO_SERVICIO(token_id).call)
+                        for token_id in range(proximo_token)
+                    ),
+                    return_exceptions=True,
+                )
+
+            # Contar estados (los tokens con error o revertidos se omiten)
+            conteo_estados = {1: 0, 2: 0, 3: 0}
+            for estado in estados:
                 if estado in conteo_estados:
                     conteo_estados[estado] += 1
-            except:
-                continue
 
         total_servicios = sum(conteo_estados.values())
 
@@ -564,7 +934,7 @@ async def obtener_resumen_general():
             },
         }
     except Exception as e:
-        print(f"❌ Error en obtener_resumen_general: {str(e)}")
+        logger.error("❌ Error en obtener_resumen_general: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -577,10 +947,16 @@ async def obtener_servicios_usuario(usuarioAddress: str):
     - **Retorna**: lista de tokenIds que posee el usuario
     """
     try:
-        # Redirigir a la nueva función de estadísticas
-        stats = await obtener_estadisticas_wallet(usuarioAddress)
+        wallet_address = checksum_address(usuarioAddress)
 
-        servicios = [servicio["tokenId"] for servicio in stats["servicios"]]
+        # Índice de eventos en memoria; si no está al día se consulta el
+        # contrato, que recorre todos los tokens dentro del eth_call
+        servicios = state_index.tokens_of(wallet_address)
+        if servicios is None:
+            tokenIds, _, _ = await run_in_threadpool(
+                FN_OBTENER_SERVICIOS_CON_ESTADOS(wallet_address).call
+            )
+            servicios = [int(token_id) for token_id in tokenIds]
 
         return {
             "usuario": usuarioAddress,
@@ -604,18 +980,20 @@ async def configurar_uri_estado(request: ConfigurarURIRequest):
     - **Gasta gas** - Transacción en blockchain
     """
     try:
-        if request.estado not in [1, 2, 3]:
+        if request.estado not in ESTADOS_SERVICIO:
             raise ValueError("Estado debe ser 1, 2 o 3")
 
-        print(f"🎯 Configurando URI para estado {request.estado}: {request.nuevaURI}")
-
-        function = contract.functions.configurarURIEstado(
-            request.estado, request.nuevaURI
+        logger.debug(
+            "🎯 Configurando URI para estado %s: %s", request.estado, request.nuevaURI
         )
-        tx_result = build_and_send_transaction(function)
+
+        function = FN_CONFIGURAR_URI_ESTADO(request.estado, request.nuevaURI)
+        tx_result, _ = await run_in_threadpool(build_and_send_transaction, function)
+        # Cambia la URI de todos los tokens en ese estado
+        view_cache.invalidate()
 
         # Registrar transacción en el log
-        log_transaction(
+        enqueue_log_transaction(
             tx_hash=tx_result["transactionHash"],
             function_name="configurarURIEstado",
             parameters={"estado": request.estado, "nuevaURI": request.nuevaURI},
@@ -623,12 +1001,10 @@ async def configurar_uri_estado(request: ConfigurarURIRequest):
             status="success" if tx_result["status"] == 1 else "failed",
         )
 
-        estados_map = {1: "CREADO", 2: "ENCONTRADO", 3: "FINALIZADO"}
-
         return {
             "success": True,
             "estado": request.estado,
-            "estadoNombre": estados_map.get(request.estado),
+            "estadoNombre": ESTADOS_SERVICIO.get(request.estado),
             "uri": request.nuevaURI,
             "transaction": tx_result,
         }
@@ -645,9 +1021,10 @@ async def obtener_info_contrato():
     - **Sin gas** - Solo lectura
     """
     try:
-        nombre = contract.functions.name().call()
-        simbolo = contract.functions.symbol().call()
-        proximo_token_id = contract.functions.obtenerProximoTokenId().call()
+        (nombre, simbolo), proximo_token_id = await asyncio.gather(
+            run_in_threadpool(contract_metadata),
+            run_in_threadpool(FN_OBTENER_PROXIMO_TOKEN_ID().call),
+        )
 
         return {
             "contractAddress": CONTRACT_ADDRESS,
@@ -671,7 +1048,7 @@ async def obtener_info_cuenta():
     - **Sin gas** - Solo lectura
     """
     try:
-        balance = web3.eth.get_balance(ACCOUNT_ADDRESS)
+        balance = await run_in_threadpool(web3.eth.get_balance, ACCOUNT_ADDRESS)
         balance_eth = web3.from_wei(balance, "ether")
 
         return {
@@ -691,8 +1068,10 @@ async def health_check():
     - **Sin gas** - Solo lectura
     """
     try:
-        is_connected = web3.is_connected()
-        block_number = web3.eth.block_number if is_connected else None
+        is_connected = await run_in_threadpool(web3.is_connected)
+        block_number = (
+            await run_in_threadpool(web3.eth.get_block_number) if is_connected else None
+        )
 
         return {
             "status": "healthy" if is_connected else "disconnected",
@@ -712,14 +1091,35 @@ async def health_check():
 
 
 # ==================== ENDPOINTS DE LOGS ====================
+def _ndjson_lines(records):
+    """Serializa cada registro como una línea JSON"""
+    for record in records:
+        if orjson is not None:
+            try:
+                yield orjson.dumps(record) + b"\n"
+                continue
+            except TypeError:  # p. ej. enteros de más de 64 bits
+                pass
+        yield json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
 @app.get("/logs/transacciones")
-async def obtener_logs_transacciones(limit: int = 50):
+async def obtener_logs_transacciones(limit: int = 50, stream: bool = False):
     """
     Historial de Transacciones
 
     - **Sin gas** - Solo lectura
+    - **stream=true**: respuesta NDJSON, una transacción por línea
     """
     try:
+        if stream:
+            from transaction_logger import iter_transaction_history
+
+            return StreamingResponse(
+                _ndjson_lines(iter_transaction_history(limit)),
+                media_type="application/x-ndjson",
+            )
+
         from transaction_logger import get_transaction_history
 
         transactions = get_transaction_history(limit)
@@ -0,0 +1,114 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Multicall3 está desplegado en la misma dirección en Arbitrum Sepolia y la
+# mayoría de redes EVM
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "name": "aggregate3",
+        "type": "function",
+        "stateMutability": "view",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+            }
+        ],
+    }
+]
+
+# Máximo de subllamadas por eth_call, para no superar los límites del nodo RPC
+MULTICALL_BATCH_SIZE = 500
+
+
+def _normalize_output(web3, output_abi: dict, value: Any) -> Any:
+    """Direcciones en formato checksum, igual que devuelve ContractFunction.call
+
+    ``web3.codec.decode`` devuelve las direcciones en minúsculas.
+    """
+    abi_type = output_abi["type"]
+    if abi_type.endswith("]"):
+        item_abi = dict(output_abi, type=abi_type[: abi_type.rindex("[")])
+        return [_normalize_output(web3, item_abi, item) for item in value]
+    if abi_type == "address":
+        return web3.to_checksum_address(value)
+    return value
+
+
+def multicall_view(
+    web3,
+    contract,
+    calls: Sequence[Tuple[str, tuple]],
+    batch_size: int = MULTICALL_BATCH_SIZE,
+    block_identifier: Any = "latest",
+) -> List[Optional[Any]]:
+    """Ejecuta funciones view del contrato agrupadas en eth_calls de Multicall3
+
+    Cada elemento de ``calls`` es ``(nombre_funcion, args)``. Devuelve un valor
+    decodificado por llamada, en el mismo orden, o ``None`` si esa llamada
+    revirtió. Los errores de la propia llamada a Multicall3 se propagan.
+    ``block_identifier`` fija todos los lotes al mismo bloque.
+    """
+    multicall = web3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+    outputs = {}
+    results = []
+
+    for start in range(0, len(calls), batch_size):
+        batch = calls[start : start + batch_size]
+        call3 = [
+            (contract.address, True, contract.encodeABI(fn_name=fn, args=args))
+            for fn, args in batch
+        ]
+        return_data = multicall.functions.aggregate3(call3).call(
+            block_identifier=block_identifier
+        )
+
+        for (fn, args), (success, data) in zip(batch, return_data):
+            if not success:
+                results.append(None)
+                continue
+
+            if fn not in outputs:
+                fn_outputs = getattr(contract.functions, fn)(*args).abi["outputs"]
+                outputs[fn] = (fn_outputs, [output["type"] for output in fn_outputs])
+
+            fn_outputs, output_types = outputs[fn]
+            values = web3.codec.decode(output_types, data)
+            decoded = [
+                _normalize_output(web3, output, value)
+                for output, value in zip(fn_outputs, values)
+            ]
+            results.append(decoded[0] if len(decoded) == 1 else decoded)
+
+    return results
+
+
+def call_views(web3, contract, calls: Sequence[Tuple[str, tuple]]) -> List[Any]:
+    """Como ``multicall_view``, pero sin resultados ``None``
+
+    Si Multicall3 no está disponible o alguna llamada revierte, repite las
+    llamadas una a una para que el error real se propague al llamador.
+    """
+    try:
+        results = multicall_view(web3, contract, calls)
+        if None not in results:
+            return results
+    except Exception:
+        pass
+
+    return [getattr(contract.functions, fn)(*args).call() for fn, args in calls]
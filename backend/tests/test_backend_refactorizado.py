@@ -63,6 +63,17 @@ class BackendTesterRefactorizado:
         if details and not success:
             print(f"   Error: {details}")
 
+    def wait_for_estado(self, token_id, estado, timeout=3.0, interval=0.1):
+        """Consulta el estado del token hasta que coincida o se agote el tiempo"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            response, _ = self.make_request("GET", f"/servicios/{token_id}/estado")
+            if response is not None and response.status_code == 200:
+                if response.json().get("estado") == estado:
+                    return True
+            time.sleep(interval)
+        return False
+
     def make_request(self, method, endpoint, data=None, params=None):
         """Realiza una petición HTTP y mide el tiempo de respuesta"""
         start_time = time.time()
@@ -200,7 +211,7 @@ class BackendTesterRefactorizado:
                     {"tokenId": self.created_token_id, "estado": result.get("estado")},
                     response_time,
                 )
-                time.sleep(3)  # Esperar confirmación
+                self.wait_for_estado(self.created_token_id, 1)
             else:
                 self.log_test("Crear Servicio", False, result, response_time)
         else:
@@ -325,7 +336,7 @@ class BackendTesterRefactorizado:
                 },
                 response_time,
             )
-            time.sleep(3)  # Esperar confirmación
+            self.wait_for_estado(self.created_token_id, 2)
         else:
             error_detail = (
                 response.json().get("detail") if response else "Sin respuesta"
@@ -414,7 +425,7 @@ class BackendTesterRefactorizado:
                 {"estado": result.get("estadoNombre")},
                 response_time,
             )
-            time.sleep(3)
+            self.wait_for_estado(self.created_token_id, 3)
         else:
             # Opción 2: Usar cambiar estado
             data = {"nuevoEstado": 3}
@@ -430,7 +441,7 @@ class BackendTesterRefactorizado:
                     {"estadoFinal": result.get("nuevoEstadoNombre")},
                     response_time,
                 )
-                time.sleep(3)
+                self.wait_for_estado(self.created_token_id, 3)
             else:
                 error_detail = (
                     response.json().get("detail") if response else "Sin respuesta"
@@ -0,0 +1,410 @@
+"""Pruebas unitarias de contract_state.py con web3 y contrato simulados
+
+Ejecución:
+    python -m pytest tests/test_contract_state.py
+"""
+
+from types import SimpleNamespace
+
+import contract_state
+import pytest
+from contract_state import ZERO_ADDR, NonceManager, ServiceStateIndex, ViewCache
+
+CONTRACT_ADDRESS = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+ALICE = "0xa92d504731aa3e99df20ffd200ed03f9a55a6219"
+BOB = "0x742d35cc6634c0532925a3b8d4b6a5f6c6d5b7c8"
+
+TOPICS = {
+    "ServicioCreado": b"creado",
+    "EstadoCambiado": b"estado",
+    "Transfer": b"transfer",
+}
+OUTPUTS = {
+    "ownerOf": [{"name": "", "type": "address"}],
+    "obtenerEstadoServicio": [{"name": "", "type": "uint8"}],
+}
+
+
+def checksum(address):
+    """Checksum simulado: basta con que sea distinto de la forma en minúsculas"""
+    return "0x" + address[2:].upper()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeEvent:
+    """process_log devuelve los args que trae el log simulado"""
+
+    def process_log(self, log):
+        if log.get("corrupt"):
+            raise ValueError("log no decodificable")
+        return {"args": log["args"]}
+
+
+class FakeContract:
+    def __init__(self, estados, propietarios):
+        self.address = CONTRACT_ADDRESS
+        # Valores en el bloque de inicialización; None = el token no existe
+        self.values = {}
+        for token_id, (estado, propietario) in enumerate(zip(estados, propietarios)):
+            self.values[("obtenerEstadoServicio", (token_id,))] = estado
+            self.values[("ownerOf", (token_id,))] = propietario
+        self.total = len(estados)
+        self.view_calls = []
+
+        def proximo_token_id():
+            return SimpleNamespace(call=lambda block_identifier: self.total)
+
+        def view(fn):
+            def build(*args):
+                def call():
+                    self.view_calls.append((fn, args))
+                    return self.values[(fn, args)]
+
+                return SimpleNamespace(abi={"outputs": OUTPUTS[fn]}, call=call)
+
+            return build
+
+        self.functions = SimpleNamespace(
+            obtenerProximoTokenId=proximo_token_id,
+            obtenerEstadoServicio=view("obtenerEstadoServicio"),
+            ownerOf=view("ownerOf"),
+        )
+        self.events = SimpleNamespace(
+            ServicioCreado=FakeEvent,
+            EstadoCambiado=FakeEvent,
+            Transfer=FakeEvent,
+        )
+
+    def encodeABI(self, fn_name, args):
+        return (fn_name, tuple(args))
+
+
+class FakeWeb3:
+    """Nodo simulado: Multicall3 con direcciones en minúsculas, como
+    ``web3.codec.decode``, y logs por bloque para eth_getLogs"""
+
+    def __init__(self, contract, block_number):
+        self.logs = {}  # bloque -> logs
+        self.get_logs_calls = []
+        self.nonce = 0
+        self.nonce_reads = 0
+
+        def aggregate3(call3):
+            def call(block_identifier):
+                result = []
+                for _, _, key in call3:
+                    value = contract.values[key]
+                    result.append((value is not None, value))
+                return result
+
+            return SimpleNamespace(call=call)
+
+        multicall = SimpleNamespace(functions=SimpleNamespace(aggregate3=aggregate3))
+        self.eth = SimpleNamespace(
+            block_number=block_number,
+            contract=lambda address, abi: multicall,
+            get_logs=self._get_logs,
+            get_transaction_count=self._get_transaction_count,
+        )
+        self.codec = SimpleNamespace(decode=lambda types, data: (data,))
+        self.to_checksum_address = checksum
+        self.to_hex = lambda value: "0x" + value.hex()
+
+    def _get_logs(self, params):
+        self.get_logs_calls.append((params["fromBlock"], params["toBlock"]))
+        return [
+            log
+            for block in range(params["fromBlock"], params["toBlock"] + 1)
+            for log in self.logs.get(block, [])
+        ]
+
+    def _get_transaction_count(self, address, block_identifier):
+        self.nonce_reads += 1
+        return self.nonce
+
+
+def creado_log():
+    return {"topics": [TOPICS["ServicioCreado"]], "args": {}}
+
+
+def estado_log(anterior, nuevo):
+    return {
+        "topics": [TOPICS["EstadoCambiado"]],
+        "args": {"estadoAnterior": anterior, "nuevoEstado": nuevo},
+    }
+
+
+def transfer_log(token_id, origen, destino):
+    return {
+        "topics": [TOPICS["Transfer"]],
+        "args": {"tokenId": token_id, "from": origen, "to": destino},
+    }
+
+
+def make_index(estados, propietarios, block_number=50, block_range=10, max_age=60):
+    contract = FakeContract(estados, propietarios)
+    web3 = FakeWeb3(contract, block_number)
+    index = ServiceStateIndex(
+        web3, contract, TOPICS, (1, 2, 3), block_range, max_age=max_age
+    )
+    return index, web3
+
+
+# ==================== ServiceStateIndex ====================
+def test_index_not_ready_before_sync():
+    index, _ = make_index([1], [ALICE])
+
+    assert index.snapshot() is None
+    assert index.tokens_of(checksum(ALICE)) is None
+
+
+def test_index_seed_counts_states_and_checksummed_owners():
+    index, _ = make_index([1, 2, 3, None], [ALICE, ALICE, BOB, None])
+
+    index.sync()
+
+    assert index.snapshot() == (4, {1: 1, 2: 1, 3: 1})
+    assert index.tokens_of(checksum(ALICE)) == [0, 1]
+    assert index.tokens_of(checksum(BOB)) == [2]
+
+
+def test_index_applies_transfer_after_seed():
+    index, web3 = make_index([1, 1], [ALICE, ALICE])
+    index.sync()
+
+    # Los eventos decodificados traen direcciones en checksum
+    web3.logs[51] = [transfer_log(0, checksum(ALICE), checksum(BOB))]
+    web3.eth.block_number = 51
+    index.sync()
+
+    assert index.tokens_of(checksum(ALICE)) == [1]
+    assert index.tokens_of(checksum(BOB)) == [0]
+
+
+def test_index_applies_creation_state_change_and_mint():
+    index, web3 = make_index([1], [ALICE])
+    index.sync()
+
+    web3.logs[52] = [
+        transfer_log(1, ZERO_ADDR, checksum(BOB)),
+        creado_log(),
+        estado_log(1, 2),
+    ]
+    web3.logs[55] = [estado_log(2, 3)]
+    web3.eth.block_number = 60
+    index.sync()
+
+    assert index.snapshot() == (2, {1: 1, 2: 0, 3: 1})
+    assert index.tokens_of(checksum(BOB)) == [1]
+    assert index.tokens_of(ZERO_ADDR) == []
+
+
+def test_index_fetches_logs_in_block_ranges():
+    index, web3 = make_index([], [], block_number=50, block_range=10)
+    index.sync()
+
+    web3.eth.block_number = 75
+    index.sync()
+
+    assert web3.get_logs_calls == [(51, 60), (61, 70), (71, 75)]
+
+
+def test_index_retries_failed_range_without_double_counting():
+    index, web3 = make_index([1], [ALICE])
+    index.sync()
+
+    bad = estado_log(1, 2)
+    bad["corrupt"] = True
+    web3.logs[51] = [creado_log(), transfer_log(1, ZERO_ADDR, checksum(BOB))]
+    web3.logs[52] = [bad]
+    web3.eth.block_number = 52
+
+    with pytest.raises(ValueError):
+        index.sync()
+    # Nada del rango fallido se aplicó
+    assert index.snapshot() == (1, {1: 1, 2: 0, 3: 0})
+    assert index.tokens_of(checksum(BOB)) == []
+
+    del bad["corrupt"]
+    index.sync()
+
+    assert index.snapshot() == (2, {1: 1, 2: 1, 3: 0})
+    assert index.tokens_of(checksum(BOB)) == [1]
+    assert web3.get_logs_calls == [(51, 52), (51, 52)]
+
+
+def test_index_rejects_unknown_state_without_applying():
+    index, web3 = make_index([1], [ALICE])
+    index.sync()
+
+    web3.logs[51] = [creado_log(), estado_log(1, 7)]
+    web3.eth.block_number = 51
+
+    with pytest.raises(ValueError):
+        index.sync()
+    assert index.snapshot() == (1, {1: 1, 2: 0, 3: 0})
+
+
+def test_index_goes_stale_when_sync_keeps_failing(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(contract_state, "time", clock)
+    index, web3 = make_index([1], [ALICE], max_age=15)
+    index.sync()
+
+    bad = estado_log(1, 2)
+    bad["corrupt"] = True
+    web3.logs[51] = [bad]
+    web3.eth.block_number = 51
+    clock.now += 10
+    with pytest.raises(ValueError):
+        index.sync()
+    assert index.snapshot() == (1, {1: 1, 2: 0, 3: 0})
+
+    clock.now += 10
+    assert index.snapshot() is None
+
+    del bad["corrupt"]
+    index.sync()
+    assert index.snapshot() == (1, {1: 0, 2: 1, 3: 0})
+
+
+def test_index_tokens_of_goes_stale_when_sync_keeps_failing(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(contract_state, "time", clock)
+    index, _ = make_index([1], [ALICE], max_age=15)
+    index.sync()
+
+    clock.now += 16
+
+    assert index.tokens_of(checksum(ALICE)) is None
+
+
+def test_index_waits_for_required_block_after_own_transaction():
+    index, web3 = make_index([1], [ALICE])
+    index.sync()
+
+    # La transacción se minó en el bloque 53; el índice va por el 50
+    index.require_block(53)
+    assert index.tokens_of(checksum(BOB)) is None
+    assert index.snapshot() is None
+
+    web3.logs[53] = [transfer_log(1, ZERO_ADDR, checksum(BOB)), creado_log()]
+    web3.eth.block_number = 53
+    index.sync()
+
+    assert index.tokens_of(checksum(BOB)) == [1]
+    assert index.snapshot() == (2, {1: 2, 2: 0, 3: 0})
+
+
+# ==================== NonceManager ====================
+def test_nonce_manager_reserves_consecutive_nonces_from_one_read():
+    web3 = FakeWeb3(FakeContract([], []), 0)
+    web3.nonce = 7
+    manager = NonceManager(web3, checksum(ALICE))
+
+    assert [manager.next_nonce() for _ in range(3)] == [7, 8, 9]
+    assert web3.nonce_reads == 1
+
+
+def test_nonce_manager_resync_rereads_chain_after_failure():
+    web3 = FakeWeb3(FakeContract([], []), 0)
+    web3.nonce = 7
+    manager = NonceManager(web3, checksum(ALICE))
+    manager.next_nonce()
+    manager.next_nonce()
+
+    # La transacción con nonce 8 falló: la cadena sigue esperando el 8
+    web3.nonce = 8
+    manager.resync()
+
+    assert manager.next_nonce() == 8
+    assert web3.nonce_reads == 2
+
+
+def test_nonce_manager_resyncs_after_interval(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(contract_state, "time", clock)
+    web3 = FakeWeb3(FakeContract([], []), 0)
+    manager = NonceManager(web3, checksum(ALICE), resync_interval=60)
+    manager.next_nonce()
+
+    web3.nonce = 5
+    clock.now += 61
+
+    assert manager.next_nonce() == 5
+
+
+# ==================== ViewCache ====================
+def make_cache(monkeypatch, maxsize=10, ttl=5.0):
+    clock = FakeClock()
+    monkeypatch.setattr(contract_state, "time", clock)
+    contract = FakeContract([1, 2], [ALICE, BOB])
+    return ViewCache(contract, maxsize, ttl), contract, clock
+
+
+def test_view_cache_reuses_value_within_ttl(monkeypatch):
+    cache, contract, clock = make_cache(monkeypatch)
+
+    assert cache.call("obtenerEstadoServicio", 0) == 1
+    clock.now += 4
+    assert cache.call("obtenerEstadoServicio", 0) == 1
+    assert len(contract.view_calls) == 1
+
+    clock.now += 2
+    contract.values[("obtenerEstadoServicio", (0,))] = 2
+    assert cache.call("obtenerEstadoServicio", 0) == 2
+    assert len(contract.view_calls) == 2
+
+
+def test_view_cache_invalidates_single_token(monkeypatch):
+    cache, contract, _ = make_cache(monkeypatch)
+    cache.call("obtenerEstadoServicio", 0)
+    cache.call("obtenerEstadoServicio", 1)
+
+    contract.values[("obtenerEstadoServicio", (0,))] = 3
+    cache.invalidate(0)
+
+    assert cache.call("obtenerEstadoServicio", 0) == 3
+    assert cache.call("obtenerEstadoServicio", 1) == 2
+    assert len(contract.view_calls) == 3
+
+
+def test_view_cache_discards_read_started_before_invalidation(monkeypatch):
+    cache, contract, _ = make_cache(monkeypatch)
+    key = ("obtenerEstadoServicio", (0,))
+
+    # Una transacción invalida el token mientras la lectura está en curso
+    original = contract.functions.obtenerEstadoServicio
+
+    def racing_view(*args):
+        function = original(*args)
+
+        def call():
+            value = function.call()
+            cache.invalidate(0)
+            contract.values[key] = 2
+            return value
+
+        return SimpleNamespace(call=call)
+
+    contract.functions.obtenerEstadoServicio = racing_view
+    assert cache.call("obtenerEstadoServicio", 0) == 1
+
+    contract.functions.obtenerEstadoServicio = original
+    assert cache.call("obtenerEstadoServicio", 0) == 2
+
+
+def test_view_cache_evicts_least_recent_entries(monkeypatch):
+    cache, contract, _ = make_cache(monkeypatch, maxsize=1)
+    cache.call("obtenerEstadoServicio", 0)
+    cache.call("obtenerEstadoServicio", 1)
+    cache.call("obtenerEstadoServicio", 0)
+
+    assert len(contract.view_calls) == 3
@@ -0,0 +1,158 @@
+"""Pruebas unitarias de multicall.py con web3 y contrato simulados
+
+Ejecución:
+    python -m pytest tests/test_multicall.py
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from multicall import call_views, multicall_view
+
+CONTRACT_ADDRESS = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+OWNER = "0xa92d504731aa3e99df20ffd200ed03f9a55a6219"
+
+OUTPUTS = {
+    "ownerOf": [{"name": "", "type": "address"}],
+    "obtenerEstadoServicio": [{"name": "", "type": "uint8"}],
+    "obtenerServiciosConEstados": [
+        {"name": "tokenIds", "type": "uint256[]"},
+        {"name": "estados", "type": "uint8[]"},
+        {"name": "acompanantes", "type": "address[]"},
+    ],
+}
+
+
+def checksum(address):
+    """Checksum simulado: basta con que sea distinto de la forma en minúsculas"""
+    return "0x" + address[2:].upper()
+
+
+class FakeContract:
+    """Contrato cuyas funciones view devuelven valores fijos"""
+
+    def __init__(self, values):
+        self.address = CONTRACT_ADDRESS
+        self.values = values  # (función, args) -> valor, o excepción si revierte
+        self.direct_calls = []
+        self.functions = SimpleNamespace(
+            **{fn: self._function(fn) for fn in OUTPUTS}
+        )
+
+    def _function(self, fn):
+        def build(*args):
+            def call(block_identifier="latest"):
+                self.direct_calls.append((fn, args))
+                value = self.values[(fn, args)]
+                if isinstance(value, Exception):
+                    raise value
+                return value
+
+            return SimpleNamespace(abi={"outputs": OUTPUTS[fn]}, call=call)
+
+        return build
+
+    def encodeABI(self, fn_name, args):
+        return (fn_name, tuple(args))
+
+
+class FakeWeb3:
+    """web3 simulado: aggregate3 devuelve los valores sin codificar y
+    ``codec.decode`` los entrega tal cual, con direcciones en minúsculas"""
+
+    def __init__(self, contract, fail_multicall=False):
+        self.aggregate_calls = []
+        self.blocks = []
+
+        def aggregate3(call3):
+            def call(block_identifier="latest"):
+                if fail_multicall:
+                    raise ConnectionError("multicall no disponible")
+                self.aggregate_calls.append(call3)
+                self.blocks.append(block_identifier)
+                result = []
+                for _, _, key in call3:
+                    value = contract.values[key]
+                    if isinstance(value, Exception):
+                        result.append((False, b""))
+                    else:
+                        result.append((True, value))
+                return result
+
+            return SimpleNamespace(call=call)
+
+        multicall = SimpleNamespace(functions=SimpleNamespace(aggregate3=aggregate3))
+        self.eth = SimpleNamespace(contract=lambda address, abi: multicall)
+        self.codec = SimpleNamespace(decode=self._decode)
+        self.to_checksum_address = checksum
+
+    @staticmethod
+    def _decode(types, data):
+        return data if len(types) > 1 else (data,)
+
+
+def test_multicall_view_checksums_address_outputs():
+    contract = FakeContract({("ownerOf", (1,)): OWNER})
+    web3 = FakeWeb3(contract)
+
+    assert multicall_view(web3, contract, [("ownerOf", (1,))]) == [checksum(OWNER)]
+
+
+def test_multicall_view_checksums_address_arrays():
+    acompanantes = (OWNER, "0x" + "00" * 20)
+    contract = FakeContract(
+        {("obtenerServiciosConEstados", (OWNER,)): ((0, 1), (1, 2), acompanantes)}
+    )
+    web3 = FakeWeb3(contract)
+
+    [(token_ids, estados, decoded)] = multicall_view(
+        web3, contract, [("obtenerServiciosConEstados", (OWNER,))]
+    )
+
+    assert list(token_ids) == [0, 1]
+    assert list(estados) == [1, 2]
+    assert decoded == [checksum(address) for address in acompanantes]
+
+
+def test_multicall_view_reverted_calls_return_none():
+    contract = FakeContract(
+        {
+            ("obtenerEstadoServicio", (0,)): 1,
+            ("obtenerEstadoServicio", (1,)): ValueError("token inexistente"),
+        }
+    )
+    web3 = FakeWeb3(contract)
+
+    calls = [("obtenerEstadoServicio", (0,)), ("obtenerEstadoServicio", (1,))]
+    assert multicall_view(web3, contract, calls) == [1, None]
+
+
+def test_multicall_view_batches_and_pins_block():
+    contract = FakeContract(
+        {("obtenerEstadoServicio", (token_id,)): 1 for token_id in range(5)}
+    )
+    web3 = FakeWeb3(contract)
+
+    calls = [("obtenerEstadoServicio", (token_id,)) for token_id in range(5)]
+    results = multicall_view(web3, contract, calls, batch_size=2, block_identifier=7)
+
+    assert results == [1] * 5
+    assert [len(batch) for batch in web3.aggregate_calls] == [2, 2, 1]
+    assert web3.blocks == [7, 7, 7]
+
+
+def test_call_views_falls_back_to_direct_calls():
+    contract = FakeContract({("ownerOf", (1,)): checksum(OWNER)})
+    web3 = FakeWeb3(contract, fail_multicall=True)
+
+    assert call_views(web3, contract, [("ownerOf", (1,))]) == [checksum(OWNER)]
+    assert contract.direct_calls == [("ownerOf", (1,))]
+
+
+def test_call_views_surfaces_revert_from_direct_call():
+    error = ValueError("token inexistente")
+    contract = FakeContract({("ownerOf", (9,)): error})
+    web3 = FakeWeb3(contract)
+
+    with pytest.raises(ValueError):
+        call_views(web3, contract, [("ownerOf", (9,))])
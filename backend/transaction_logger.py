@@ -1,8 +1,18 @@
 import json
 import os
+import threading
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson es opcional; se usa el parser estándar
+    orjson = None
+    _json_loads = json.loads
 
 
 class TransactionLogger:
@@ -11,6 +21,13 @@ class TransactionLogger:
     def __init__(self, log_file: str = "transfer_log.json"):
         self.log_file = Path(__file__).parent / log_file
         self.arbiscan_base_url = "https://sepolia.arbiscan.io/tx"
+        # Log parseado y la firma (mtime, tamaño) del archivo del que proviene
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_signature: Optional[tuple] = None
+        # Índice hash -> transacción, construido bajo demanda sobre el caché
+        self._hash_index: Optional[Dict[str, Dict[str, Any]]] = None
+        # Protege caché e índice: el registro escribe desde un hilo del pool
+        self._lock = threading.RLock()
         self._ensure_log_file()
 
     def _ensure_log_file(self):
@@ -28,22 +45,59 @@ class TransactionLogger:
             }
             self._write_log(initial_data)
 
+    def _file_signature(self) -> tuple:
+        """Firma del archivo de log para detectar cambios externos"""
+        st = self.log_file.stat()
+        return st.st_mtime_ns, st.st_size
+
+    @staticmethod
+    def _serialize_log(data: Dict[str, Any]) -> bytes:
+        """Serializa el log a JSON indentado, con orjson si está disponible"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(
+                    data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            except TypeError:  # p. ej. enteros de más de 64 bits
+                pass
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
     def _write_log(self, data: Dict[str, Any]):
         """Escribe datos en el archivo de log"""
-        try:
-            with open(self.log_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"❌ Error escribiendo log: {e}")
+        with self._lock:
+            self._hash_index = None
+            try:
+                # Escritura atómica: las lecturas concurrentes (el registro corre
+                # en un hilo del pool) ven el archivo anterior o el nuevo, nunca
+                # uno a medias
+                payload = self._serialize_log(data)
+                tmp_path = self.log_file.with_suffix(f".tmp{os.getpid()}")
+                tmp_path.write_bytes(payload)
+                os.replace(tmp_path, self.log_file)
+                self._cache = data
+                self._cache_signature = self._file_signature()
+            except Exception as e:
+                self._cache = None
+                print(f"❌ Error escribiendo log: {e}")
 
     def _read_log(self) -> Dict[str, Any]:
-        """Lee el archivo de log"""
-        try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"❌ Error leyendo log: {e}")
-            return {"metadata": {}, "transactions": []}
+        """Lee el archivo de log, reutilizando la versión parseada si no cambió"""
+        with self._lock:
+            try:
+                signature = self._file_signature()
+                if self._cache is not None and self._cache_signature == signature:
+                    return self._cache
+
+                self._hash_index = None
+                with open(self.log_file, "rb") as f:
+                    self._cache = _json_loads(f.read())
+                self._cache_signature = signature
+                return self._cache
+            except Exception as e:
+                self._cache = None
+                self._hash_index = None
+                print(f"❌ Error leyendo log: {e}")
+                return {"metadata": {}, "transactions": []}
 
     def log_transaction(
         self,
@@ -72,22 +126,24 @@ class TransactionLogger:
             "network": "arbitrumSepolia",
         }
 
-        # Leer log existente
-        log_data = self._read_log()
+        # Leer, modificar y escribir bajo el lock: el caché se modifica en sitio
+        with self._lock:
+            # Leer log existente
+            log_data = self._read_log()
 
-        # Agregar nueva transacción al inicio (más reciente primero)
-        log_data["transactions"].insert(0, transaction_entry)
+            # Agregar nueva transacción al inicio (más reciente primero)
+            log_data["transactions"].insert(0, transaction_entry)
 
-        # Limitar a las últimas 1000 transacciones
-        if len(log_data["transactions"]) > 1000:
-            log_data["transactions"] = log_data["transactions"][:1000]
+            # Limitar a las últimas 1000 transacciones
+            if len(log_data["transactions"]) > 1000:
+                log_data["transactions"] = log_data["transactions"][:1000]
 
-        # Actualizar metadata
-        log_data["metadata"]["last_updated"] = datetime.now().isoformat()
-        log_data["metadata"]["total_transactions"] = len(log_data["transactions"])
+            # Actualizar metadata
+            log_data["metadata"]["last_updated"] = datetime.now().isoformat()
+            log_data["metadata"]["total_transactions"] = len(log_data["transactions"])
 
-        # Escribir log actualizado
-        self._write_log(log_data)
+            # Escribir log actualizado
+            self._write_log(log_data)
 
         print(f"📝 Transacción registrada: {tx_hash}")
         print(f"🔗 Arbiscan: {arbiscan_url}")
@@ -95,19 +151,31 @@ class TransactionLogger:
     def get_transaction_history(self, limit: Optional[int] = None) -> list:
         """Obtiene el historial de transacciones"""
         log_data = self._read_log()
-        transactions = log_data.get("transactions", [])
+        # Siempre una copia: la lista en caché no debe quedar expuesta al llamador
+        return log_data.get("transactions", [])[: limit or None]
 
-        if limit:
-            return transactions[:limit]
-        return transactions
+    def iter_transaction_history(
+        self, limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Recorre el historial una transacción a la vez"""
+        # Copia de referencias: un registro concurrente inserta al inicio de la lista
+        transactions = self._read_log().get("transactions", [])[: limit or None]
+        yield from transactions
 
     def get_transaction_by_hash(self, tx_hash: str) -> Optional[Dict[str, Any]]:
         """Busca una transacción por su hash"""
-        transactions = self.get_transaction_history()
-        for tx in transactions:
-            if tx.get("transaction_hash") == tx_hash:
-                return tx
-        return None
+        # Bajo el mismo lock que lecturas y escrituras: el índice siempre
+        # corresponde al caché vigente
+        with self._lock:
+            transactions = self._read_log().get("transactions", [])
+
+            if self._hash_index is None:
+                # setdefault conserva la primera coincidencia (la más reciente)
+                self._hash_index = {}
+                for tx in transactions:
+                    self._hash_index.setdefault(tx.get("transaction_hash"), tx)
+
+            return self._hash_index.get(tx_hash)
 
     def get_transactions_by_function(self, function_name: str) -> list:
         """Obtiene transacciones por nombre de función"""
@@ -121,24 +189,15 @@ class TransactionLogger:
         if not transactions:
             return {}
 
-        # Contar por función
-        function_counts = {}
-        status_counts = {}
-        total_gas_used = 0
-
-        for tx in transactions:
-            func = tx.get("function", "unknown")
-            status = tx.get("status", "unknown")
-            gas_used = tx.get("gas_used", 0)
-
-            function_counts[func] = function_counts.get(func, 0) + 1
-            status_counts[status] = status_counts.get(status, 0) + 1
-            total_gas_used += int(gas_used) if gas_used else 0
+        # Contar por función y estado; Counter incrementa en C
+        function_counts = Counter(tx.get("function", "unknown") for tx in transactions)
+        status_counts = Counter(tx.get("status", "unknown") for tx in transactions)
+        total_gas_used = sum(int(tx.get("gas_used") or 0) for tx in transactions)
 
         return {
             "total_transactions": len(transactions),
-            "function_counts": function_counts,
-            "status_counts": status_counts,
+            "function_counts": dict(function_counts),
+            "status_counts": dict(status_counts),
             "total_gas_used": total_gas_used,
             "first_transaction": transactions[-1].get("timestamp")
             if transactions
@@ -180,6 +239,16 @@ def get_transaction_history(limit: Optional[int] = None):
     return transaction_logger.get_transaction_history(limit)
 
 
+def iter_transaction_history(limit: Optional[int] = None):
+    """Función de conveniencia para recorrer el historial como generador"""
+    return transaction_logger.iter_transaction_history(limit)
+
+
+def get_transaction_by_hash(tx_hash: str):
+    """Función de conveniencia para buscar una transacción por hash"""
+    return transaction_logger.get_transaction_by_hash(tx_hash)
+
+
 def get_statistics():
     """Función de conveniencia para obtener estadísticas"""
     return transaction_logger.get_statistics()